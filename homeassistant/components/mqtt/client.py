@@ -3,11 +3,12 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Callable, Coroutine, Iterable
-from functools import lru_cache
+from datetime import datetime
 from itertools import chain, groupby
 import logging
 from operator import attrgetter
 import ssl
+import threading
 import time
 from typing import TYPE_CHECKING, Any
 import uuid
@@ -15,6 +16,7 @@ import uuid
 import async_timeout
 import attr
 import certifi
+from lru import LRU  # pylint: disable=no-name-in-module
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -93,6 +95,9 @@ SUBSCRIBE_COOLDOWN = 0.1
 UNSUBSCRIBE_COOLDOWN = 0.1
 TIMEOUT_ACK = 10
 
+# The number of topics to cache the matching subscriptions of
+MATCHING_SUBSCRIPTIONS_CACHE_SIZE = 8192
+
 SubscribePayloadType = str | bytes  # Only bytes if encoding is None
 
 
@@ -212,7 +217,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob[[ReceiveMessage], Coroutine[Any, Any, None] | None] = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str | None = attr.ib(default="utf-8")
@@ -284,6 +288,84 @@ def _is_simple_match(topic: str) -> bool:
     return not ("+" in topic or "#" in topic)
 
 
+class _TopicTrieNode:
+    """A level of the topic trie."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: dict[str, _TopicTrieNode] = {}
+        self.subscriptions: list[Subscription] = []
+
+
+class WildcardSubscriptionTrie:
+    """Trie of the subscriptions with a wildcard topic filter.
+
+    All the topic filters share the trie, so a topic is matched by walking
+    the levels of the topic once instead of testing every topic filter.
+    Topics are matched the same way as paho's MQTTMatcher, wildcards at
+    the first level do not match topics starting with $.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root = _TopicTrieNode()
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription to the trie."""
+        node = self._root
+        for level in subscription.topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                child = node.children[level] = _TopicTrieNode()
+            node = child
+        node.subscriptions.append(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription from the trie.
+
+        Raises ValueError if the subscription is not in the trie.
+        """
+        node = self._root
+        path: list[tuple[_TopicTrieNode, str]] = []
+        for level in subscription.topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                raise ValueError(f"{subscription.topic} is not in the trie")
+            path.append((node, level))
+            node = child
+        node.subscriptions.remove(subscription)
+        # Drop the levels which are no longer used by any topic filter
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.children or child.subscriptions:
+                break
+            del parent.children[level]
+
+    def match(self, topic: str) -> list[Subscription]:
+        """Return the subscriptions with a topic filter matching the topic."""
+        levels = topic.split("/")
+        last_idx = len(levels)
+        normal = not topic.startswith("$")
+        matches: list[Subscription] = []
+        stack = [(self._root, 0)]
+        while stack:
+            node, idx = stack.pop()
+            children = node.children
+            wildcards = normal or idx > 0
+            if wildcards and (multi_level := children.get("#")) is not None:
+                matches.extend(multi_level.subscriptions)
+            if idx == last_idx:
+                matches.extend(node.subscriptions)
+                continue
+            if (child := children.get(levels[idx])) is not None:
+                stack.append((child, idx + 1))
+            if wildcards and (single_level := children.get("+")) is not None:
+                stack.append((single_level, idx + 1))
+        return matches
+
+
 class EnsureJobAfterCooldown:
     """Ensure a cool down period before executing a job.
 
@@ -376,6 +458,10 @@ class MQTT:
 
         self._simple_subscriptions: dict[str, list[Subscription]] = {}
         self._wildcard_subscriptions: list[Subscription] = []
+        self._wildcard_subscription_trie = WildcardSubscriptionTrie()
+        self._matching_subscriptions_cache: dict[str, list[Subscription]] = LRU(
+            MATCHING_SUBSCRIPTIONS_CACHE_SIZE
+        )
         # _retained_topics prevents a Subscription from receiving a
         # retained message more than once per topic. This prevents flooding
         # already active subscribers when new subscribers subscribe to a topic
@@ -387,6 +473,10 @@ class MQTT:
 
         self._paho_lock = asyncio.Lock()  # Prevents parallel calls to the MQTT client
         self._pending_operations: dict[int, asyncio.Event] = {}
+        # Messages received by the paho thread waiting for the event loop
+        self._pending_messages: list[mqtt.MQTTMessage] = []
+        self._pending_messages_lock = threading.Lock()
+        self._pending_messages_since: float | None = None
         self._pending_operations_condition = asyncio.Condition()
         self._subscribe_debouncer = EnsureJobAfterCooldown(
             INITIAL_SUBSCRIBE_COOLDOWN, self._async_perform_subscriptions
@@ -540,30 +630,28 @@ class MQTT:
         """Restore tracked subscriptions after reload."""
         for subscription in subscriptions:
             self._async_track_subscription(subscription)
-        self._matching_subscriptions.cache_clear()
 
     @callback
     def _async_track_subscription(self, subscription: Subscription) -> None:
         """Track a subscription.
 
         This method does not send a SUBSCRIBE message to the broker.
-
-        The caller is responsible clearing the cache of _matching_subscriptions.
         """
-        if _is_simple_match(subscription.topic):
-            self._simple_subscriptions.setdefault(subscription.topic, []).append(
-                subscription
-            )
+        topic = subscription.topic
+        if _is_simple_match(topic):
+            self._simple_subscriptions.setdefault(topic, []).append(subscription)
+            # Only the matches of the topic itself change
+            self._matching_subscriptions_cache.pop(topic, None)
         else:
             self._wildcard_subscriptions.append(subscription)
+            self._wildcard_subscription_trie.add(subscription)
+            self._matching_subscriptions_cache.clear()
 
     @callback
     def _async_untrack_subscription(self, subscription: Subscription) -> None:
         """Untrack a subscription.
 
         This method does not send an UNSUBSCRIBE message to the broker.
-
-        The caller is responsible clearing the cache of _matching_subscriptions.
         """
         topic = subscription.topic
         try:
@@ -572,8 +660,11 @@ class MQTT:
                 simple_subscriptions[topic].remove(subscription)
                 if not simple_subscriptions[topic]:
                     del simple_subscriptions[topic]
+                self._matching_subscriptions_cache.pop(topic, None)
             else:
                 self._wildcard_subscriptions.remove(subscription)
+                self._wildcard_subscription_trie.remove(subscription)
+                self._matching_subscriptions_cache.clear()
         except (KeyError, ValueError) as ex:
             raise HomeAssistantError("Can't remove subscription twice") from ex
 
@@ -608,11 +699,8 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self._async_track_subscription(subscription)
-        self._matching_subscriptions.cache_clear()
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -622,7 +710,6 @@ class MQTT:
         def async_remove() -> None:
             """Remove subscription."""
             self._async_untrack_subscription(subscription)
-            self._matching_subscriptions.cache_clear()
             if subscription in self._retained_topics:
                 del self._retained_topics[subscription]
             # Only unsubscribe if currently connected
@@ -780,21 +867,60 @@ class MQTT:
     def _mqtt_on_message(
         self, _mqttc: mqtt.Client, _userdata: None, msg: mqtt.MQTTMessage
     ) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        The messages are queued and the event loop is only woken up
+        for the first message of a batch, the loop handles all the
+        messages queued by the time it runs.
+        """
+        with self._pending_messages_lock:
+            self._pending_messages.append(msg)
+            if self._pending_messages_since is not None:
+                return
+            self._pending_messages_since = time.monotonic()
+        self.hass.loop.call_soon_threadsafe(self._async_handle_pending_messages)
+
+    @callback
+    def _async_handle_pending_messages(self) -> None:
+        """Handle the messages queued by the paho thread."""
+        with self._pending_messages_lock:
+            messages = self._pending_messages
+            queued_since = self._pending_messages_since
+            self._pending_messages = []
+            self._pending_messages_since = None
+        if _LOGGER.isEnabledFor(logging.DEBUG) and queued_since is not None:
+            _LOGGER.debug(
+                "Handling a batch of %s messages queued %.3f seconds ago",
+                len(messages),
+                time.monotonic() - queued_since,
+            )
+        timestamp = dt_util.utcnow()
+        for msg in messages:
+            self._async_handle_message(msg, timestamp)
+        # Entities updated by several messages of the batch write their state once
+        self._mqtt_data.state_write_requests.process_write_state_requests()
 
-    @lru_cache(None)  # pylint: disable=method-cache-max-size-none
     def _matching_subscriptions(self, topic: str) -> list[Subscription]:
-        subscriptions: list[Subscription] = []
-        if topic in self._simple_subscriptions:
-            subscriptions.extend(self._simple_subscriptions[topic])
-        for subscription in self._wildcard_subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
+        """Return the subscriptions matching a topic."""
+        if (subscriptions := self._matching_subscriptions_cache.get(topic)) is None:
+            subscriptions = self._wildcard_subscription_trie.match(topic)
+            if topic in self._simple_subscriptions:
+                subscriptions[:0] = self._simple_subscriptions[topic]
+            self._matching_subscriptions_cache[topic] = subscriptions
         return subscriptions
 
     @callback
     def _mqtt_handle_message(self, msg: mqtt.MQTTMessage) -> None:
+        """Handle a single received message."""
+        self._async_handle_message(msg, dt_util.utcnow())
+        self._mqtt_data.state_write_requests.process_write_state_requests()
+
+    @callback
+    def _async_handle_message(self, msg: mqtt.MQTTMessage, timestamp: datetime) -> None:
+        """Run the subscriptions matching a received message.
+
+        The state write requests of the entities are not processed.
+        """
         _LOGGER.debug(
             "Received%s message on %s (qos=%s): %s",
             " retained" if msg.retain else "",
@@ -802,9 +928,8 @@ class MQTT:
             msg.qos,
             msg.payload[0:8192],
         )
-        timestamp = dt_util.utcnow()
-
         subscriptions = self._matching_subscriptions(msg.topic)
+        self._mqtt_data.state_write_requests.message = msg
 
         for subscription in subscriptions:
             if msg.retain:
@@ -839,7 +964,6 @@ class MQTT:
                     timestamp,
                 ),
             )
-        self._mqtt_data.state_write_requests.process_write_state_requests(msg)
 
     def _mqtt_on_callback(
         self,
@@ -935,13 +1059,3 @@ def _raise_on_error(result_code: int) -> None:
 
     if result_code and (message := mqtt.error_string(result_code)):
         raise HomeAssistantError(f"Error talking to MQTT: {message}")
-
-
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable-next=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
@@ -255,17 +255,24 @@ class MqttValueTemplate:
 
 
 class EntityTopicState:
-    """Manage entity state write requests for subscribed topics."""
+    """Manage entity state write requests for subscribed topics.
+
+    The requests are processed after a batch of received messages is
+    handled, so an entity updated by several messages of the batch only
+    writes its state once.
+    """
 
     def __init__(self) -> None:
         """Register topic."""
-        self.subscribe_calls: dict[str, Entity] = {}
+        self.subscribe_calls: dict[str, tuple[Entity, MQTTMessage | None]] = {}
+        # The message being handled, the requests remember it for logging
+        self.message: MQTTMessage | None = None
 
     @callback
-    def process_write_state_requests(self, msg: MQTTMessage) -> None:
+    def process_write_state_requests(self) -> None:
         """Process the write state requests."""
         while self.subscribe_calls:
-            _, entity = self.subscribe_calls.popitem()
+            _, (entity, msg) = self.subscribe_calls.popitem()
             try:
                 entity.async_write_ha_state()
             except Exception:  # pylint: disable=broad-except
@@ -273,15 +280,15 @@ class EntityTopicState:
                     "Exception raised when updating state of %s, topic: "
                     "'%s' with payload: %s",
                     entity.entity_id,
-                    msg.topic,
-                    msg.payload,
+                    msg.topic if msg else None,
+                    msg.payload if msg else None,
                     exc_info=True,
                 )
 
     @callback
     def write_state_request(self, entity: Entity) -> None:
         """Register write state request."""
-        self.subscribe_calls[entity.entity_id] = entity
+        self.subscribe_calls[entity.entity_id] = (entity, self.message)
 
 
 @dataclass
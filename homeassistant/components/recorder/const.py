@@ -32,6 +32,11 @@ QUEUE_PERCENTAGE_ALLOWED_AVAILABLE_MEMORY = 0.65
 # have upgraded their sqlite version
 SQLITE_MAX_BIND_VARS = 998
 
+# The last_used_ts of shared state attributes and event data is
+# only written when it moves forward by at least this many seconds
+# so reusing the same row does not cause a write for every state
+LAST_USED_TS_INTERVAL = 3600
+
 DB_WORKER_PREFIX = "DbWorker"
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
@@ -50,6 +55,7 @@ STATISTICS_ROWS_SCHEMA_VERSION = 23
 CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
+LAST_USED_TS_SCHEMA_VERSION = 42
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
@@ -77,6 +77,7 @@ from .db_schema import (
     StatisticsShortTerm,
 )
 from .executor import DBInterruptibleThreadPoolExecutor
+from .history.recent import RecentStatesCache
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
 from .queries import (
@@ -85,6 +86,7 @@ from .queries import (
     has_events_context_ids_to_migrate,
     has_states_context_ids_to_migrate,
 )
+from .serializer import RecorderSerializer, serialize_event_task
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
@@ -191,6 +193,7 @@ class Recorder(threading.Thread):
         self._hass_started: asyncio.Future[object] = asyncio.Future()
         self.commit_interval = commit_interval
         self._queue: queue.SimpleQueue[RecorderTask] = queue.SimpleQueue()
+        self._serializer = RecorderSerializer(self)
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
@@ -216,6 +219,9 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
+        # Insert states in bulk with executemany when the dialect can
+        # return the generated state_ids in the order of the parameters
+        self._bulk_write_states = False
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
@@ -226,6 +232,9 @@ class Recorder(threading.Thread):
             self, exclude_attributes_by_domain
         )
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        # The states written during the current run, used to answer
+        # history queries for recent periods without the database
+        self.recent_states = RecentStatesCache()
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
@@ -251,6 +260,15 @@ class Recorder(threading.Thread):
         """Return the number of items in the recorder backlog."""
         return self._queue.qsize()
 
+    @property
+    def backlog_by_stage(self) -> dict[str, int]:
+        """Return the number of items waiting in each stage of the recorder.
+
+        Events are serialized ahead of the recorder thread which commits
+        them, so the serialize backlog is included in the commit backlog.
+        """
+        return {"serialize": self._serializer.backlog, "commit": self._queue.qsize()}
+
     @property
     def dialect_name(self) -> SupportedDialect | None:
         """Return the dialect the recorder uses."""
@@ -301,9 +319,17 @@ class Recorder(threading.Thread):
         """Initialize the recorder."""
         entity_filter = self.entity_filter
         exclude_event_types = self.exclude_event_types
+        serializer_put = self._serializer.queue_task
         queue_put = self._queue.put_nowait
         event_task = EventTask
 
+        @callback
+        def _queue_event(event: Event) -> None:
+            """Put an event in the serializer and the process queue."""
+            task = event_task(event)
+            serializer_put(task)
+            queue_put(task)
+
         @callback
         def _event_listener(event: Event) -> None:
             """Listen for new events and put them in the process queue."""
@@ -311,23 +337,23 @@ class Recorder(threading.Thread):
                 return
 
             if (entity_id := event.data.get(ATTR_ENTITY_ID)) is None:
-                queue_put(event_task(event))
+                _queue_event(event)
                 return
 
             if isinstance(entity_id, str):
                 if entity_filter(entity_id):
-                    queue_put(event_task(event))
+                    _queue_event(event)
                 return
 
             if isinstance(entity_id, list):
                 for eid in entity_id:
                     if entity_filter(eid):
-                        queue_put(event_task(event))
+                        _queue_event(event)
                         return
                 return
 
             # Unknown what it is.
-            queue_put(event_task(event))
+            _queue_event(event)
 
         self._event_listener = self.hass.bus.async_listen(
             MATCH_ALL,
@@ -378,7 +404,7 @@ class Recorder(threading.Thread):
         The queue grows during migration or if something really goes wrong.
         """
         size = self.backlog
-        _LOGGER.debug("Recorder queue size is: %s", size)
+        _LOGGER.debug("Recorder queue size is: %s (%s)", size, self.backlog_by_stage)
         if not self._reached_max_backlog_percentage(100):
             return
         _LOGGER.error(
@@ -452,6 +478,7 @@ class Recorder(threading.Thread):
         # We drain all the events in the queue and then insert
         # an empty one to ensure the next thing the recorder sees
         # is a request to shutdown.
+        self._serializer.clear()
         while True:
             try:
                 self._queue.get_nowait()
@@ -712,6 +739,10 @@ class Recorder(threading.Thread):
             # Give up if we could not connect
             return
 
+        # The dialect is known now so the serializer can encode
+        # events the same way the recorder thread would
+        self._serializer.start()
+
         schema_status = migration.validate_db_schema(self.hass, self, self.get_session)
         if schema_status is None:
             # Give up if we could not validate the schema
@@ -1005,19 +1036,24 @@ class Recorder(threading.Thread):
             self.backlog,
         )
 
-    def _process_one_event(self, event: Event) -> None:
+    def _process_one_event(self, task: EventTask) -> None:
         if not self.enabled:
             return
+        event = task.event
         if event.event_type == EVENT_STATE_CHANGED:
-            self._process_state_changed_event_into_session(event)
+            if self._bulk_write_states and self.schema_version == SCHEMA_VERSION:
+                self._process_state_changed_event_into_rows(task)
+            else:
+                self._process_state_changed_event_into_session(task)
         else:
-            self._process_non_state_changed_event_into_session(event)
+            self._process_non_state_changed_event_into_session(task)
         # Commit if the commit interval is zero
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
-    def _process_non_state_changed_event_into_session(self, event: Event) -> None:
+    def _process_non_state_changed_event_into_session(self, task: EventTask) -> None:
         """Process any event into the session except state changed."""
+        event = task.event
         session = self.event_session
         assert session is not None
         dbevent = Events.from_event(event)
@@ -1039,31 +1075,36 @@ class Recorder(threading.Thread):
             return
 
         event_data_manager = self.event_data_manager
-        if not (shared_data_bytes := event_data_manager.serialize_from_event(event)):
+        _, shared_data_bytes, hash_ = serialize_event_task(self, task)
+        if not shared_data_bytes:
             return
 
         # Map the event data to the EventData table
         shared_data = shared_data_bytes.decode("utf-8")
         # Matching attributes found in the pending commit
+        time_fired_ts = cast(float, dbevent.time_fired_ts)
         if pending_event_data := event_data_manager.get_pending(shared_data):
             dbevent.event_data_rel = pending_event_data
+            event_data_manager.mark_pending_used(shared_data, time_fired_ts)
         # Matching attributes id found in the cache
         elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
-            (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
-            and (data_id := event_data_manager.get(shared_data, hash_, session))
+            hash_ and (data_id := event_data_manager.get(shared_data, hash_, session))
         ):
             dbevent.data_id = data_id
+            event_data_manager.mark_used(data_id, time_fired_ts)
         else:
             # No matching attributes found, save them in the DB
             dbevent_data = EventData(shared_data=shared_data, hash=hash_)
             event_data_manager.add_pending(dbevent_data)
+            event_data_manager.mark_pending_used(shared_data, time_fired_ts)
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
 
         self._add_to_session(session, dbevent)
 
-    def _process_state_changed_event_into_session(self, event: Event) -> None:
+    def _process_state_changed_event_into_session(self, task: EventTask) -> None:
         """Process a state_changed event into the session."""
+        event = task.event
         state_attributes_manager = self.state_attributes_manager
         states_meta_manager = self.states_meta_manager
         entity_removed = not event.data.get("new_state")
@@ -1084,9 +1125,8 @@ class Recorder(threading.Thread):
         if states_meta_manager.active:
             dbstate.entity_id = None
 
-        if entity_id is None or not (
-            shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
-        ):
+        _, shared_attrs_bytes, hash_ = serialize_event_task(self, task)
+        if entity_id is None or not shared_attrs_bytes:
             return
 
         assert self.event_session is not None
@@ -1111,14 +1151,16 @@ class Recorder(threading.Thread):
         # Map the event data to the StateAttributes table
         shared_attrs = shared_attrs_bytes.decode("utf-8")
         dbstate.attributes = None
+        last_updated_ts = cast(float, dbstate.last_updated_ts)
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
             dbstate.state_attributes = pending_event_data
+            state_attributes_manager.mark_pending_used(shared_attrs, last_updated_ts)
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
         ) or (
-            (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
+            hash_
             and (
                 attributes_id := state_attributes_manager.get(
                     shared_attrs, hash_, session
@@ -1126,15 +1168,105 @@ class Recorder(threading.Thread):
             )
         ):
             dbstate.attributes_id = attributes_id
+            state_attributes_manager.mark_used(attributes_id, last_updated_ts)
         else:
             # No matching attributes found, save them in the DB
             dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
             state_attributes_manager.add_pending(dbstate_attributes)
+            state_attributes_manager.mark_pending_used(shared_attrs, last_updated_ts)
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
+        if self.schema_version == SCHEMA_VERSION:
+            self.recent_states.add(
+                entity_id, dbstate.state, last_updated_ts, dbstate.last_changed_ts
+            )
         self._add_to_session(session, dbstate)
 
+    def _process_state_changed_event_into_rows(self, task: EventTask) -> None:
+        """Process a state_changed event into rows to insert in bulk.
+
+        This is the same as _process_state_changed_event_into_session
+        except the state is not added to the session as a States object.
+        Its row is inserted with executemany when the session is committed.
+        """
+        event = task.event
+        state_attributes_manager = self.state_attributes_manager
+        states_meta_manager = self.states_meta_manager
+        states_manager = self.states_manager
+        entity_removed = not event.data.get("new_state")
+        entity_id = event.data["entity_id"]
+
+        row = States.params_from_event(event)
+        old_row = states_manager.pop_pending_row(entity_id)
+        if old_row is None:
+            row["old_state_id"] = states_manager.pop_committed(entity_id)
+
+        if states_meta_manager.active:
+            row["entity_id"] = None
+
+        _, shared_attrs_bytes, hash_ = serialize_event_task(self, task)
+        if entity_id is None or not shared_attrs_bytes:
+            return
+
+        assert self.event_session is not None
+        session = self.event_session
+        states_meta: StatesMeta | None = None
+        # Map the entity_id to the StatesMeta table
+        if pending_states_meta := states_meta_manager.get_pending(entity_id):
+            states_meta = pending_states_meta
+        elif metadata_id := states_meta_manager.get(entity_id, session, True):
+            row["metadata_id"] = metadata_id
+        elif states_meta_manager.active and entity_removed:
+            # See _process_state_changed_event_into_session
+            return
+        else:
+            states_meta = StatesMeta(entity_id=entity_id)
+            states_meta_manager.add_pending(states_meta)
+            self._add_to_session(session, states_meta)
+
+        # Map the event data to the StateAttributes table
+        shared_attrs = shared_attrs_bytes.decode("utf-8")
+        state_attributes: StateAttributes | None = None
+        last_updated_ts: float = row["last_updated_ts"]
+        # Matching attributes found in the pending commit
+        if pending_attributes := state_attributes_manager.get_pending(shared_attrs):
+            state_attributes = pending_attributes
+            state_attributes_manager.mark_pending_used(shared_attrs, last_updated_ts)
+        # Matching attributes id found in the cache
+        elif (
+            attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
+        ) or (
+            hash_
+            and (
+                attributes_id := state_attributes_manager.get(
+                    shared_attrs, hash_, session
+                )
+            )
+        ):
+            row["attributes_id"] = attributes_id
+            state_attributes_manager.mark_used(attributes_id, last_updated_ts)
+        else:
+            # No matching attributes found, save them in the DB
+            state_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
+            state_attributes_manager.add_pending(state_attributes)
+            state_attributes_manager.mark_pending_used(shared_attrs, last_updated_ts)
+            self._add_to_session(session, state_attributes)
+
+        if entity_removed:
+            row["state"] = None
+        self.recent_states.add(
+            entity_id, row["state"], last_updated_ts, row["last_changed_ts"]
+        )
+        self._event_session_has_pending_writes = True
+        states_manager.add_pending_row(
+            None if entity_removed else entity_id,
+            row,
+            old_row,
+            state_attributes,
+            states_meta,
+        )
+
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
         if isinstance(err.__cause__, sqlite3.DatabaseError):
@@ -1172,6 +1304,11 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if self.states_manager.has_pending_rows():
+            session.flush()
+            self.states_manager.write_pending_rows(session)
+        self.state_attributes_manager.write_pending_last_used_ts(session)
+        self.event_data_manager.write_pending_last_used_ts(session)
         session.commit()
         self._event_session_has_pending_writes = False
         # We just committed the state attributes to the database
@@ -1395,6 +1532,9 @@ class Recorder(threading.Thread):
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
         Base.metadata.create_all(self.engine)
+        self._bulk_write_states = (
+            self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
 
@@ -1411,6 +1551,7 @@ class Recorder(threading.Thread):
             end_incomplete_runs(session, self.recorder_runs_manager.recording_start)
             self.recorder_runs_manager.start(session)
 
+        self.recent_states.start(self.recorder_runs_manager.recording_start.timestamp())
         self._open_event_session()
 
     def _schedule_compile_missing_statistics(self) -> None:
@@ -1450,5 +1591,6 @@ class Recorder(threading.Thread):
         try:
             self._end_session()
         finally:
+            self._serializer.stop()
             self._stop_executor()
             self._close_connection()
@@ -68,7 +68,7 @@ class Base(DeclarativeBase):
     """Base class for tables."""
 
 
-SCHEMA_VERSION = 41
+SCHEMA_VERSION = 42
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -335,6 +335,7 @@ class EventData(Base):
     shared_data: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    last_used_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -504,6 +505,46 @@ class States(Base):
 
         return dbstate
 
+    @staticmethod
+    def params_from_event(event: Event) -> dict[str, Any]:
+        """Create insert parameters from a state_changed event.
+
+        The parameters match States.from_event and are used to insert
+        states in bulk without building ORM objects.
+        """
+        state: State | None = event.data.get("new_state")
+        context = event.context
+        params: dict[str, Any] = {
+            "entity_id": event.data["entity_id"],
+            "state": None,
+            "attributes": None,
+            "event_id": None,
+            "last_changed": None,
+            "last_changed_ts": None,
+            "last_updated": None,
+            "last_updated_ts": None,
+            "old_state_id": None,
+            "attributes_id": None,
+            "context_id": None,
+            "context_user_id": None,
+            "context_parent_id": None,
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+            "context_id_bin": ulid_to_bytes_or_none(context.id),
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+            "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+            "metadata_id": None,
+        }
+        # None state means the state was removed from the state machine
+        if state is None:
+            params["last_updated_ts"] = dt_util.utc_to_timestamp(event.time_fired)
+            return params
+
+        params["state"] = state.state
+        params["last_updated_ts"] = dt_util.utc_to_timestamp(state.last_updated)
+        if state.last_updated != state.last_changed:
+            params["last_changed_ts"] = dt_util.utc_to_timestamp(state.last_changed)
+        return params
+
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
         context = Context(
@@ -548,6 +589,7 @@ class StateAttributes(Base):
     shared_attrs: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    last_used_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
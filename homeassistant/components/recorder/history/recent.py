@@ -0,0 +1,273 @@
+"""Keep the recently recorded states in memory to answer history queries."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+import threading
+from typing import Any
+
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+)
+from homeassistant.core import split_entity_id
+
+from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
+
+# The number of states to keep in memory for each entity
+#
+# Each state costs two doubles and a reference to the
+# state string which is shared with the State object
+MAX_STATES_PER_ENTITY = 2048
+# The number of states to drop at once when an entity
+# has more states than MAX_STATES_PER_ENTITY
+EVICT_STATES = 256
+
+
+class _RecentEntityStates:
+    """The recently recorded states of an entity sorted by last_updated.
+
+    Every state recorded with a last_updated after complete_after_ts
+    is in the arrays. last_changed is 0 when it is the same as
+    last_updated, the same way it is NULL in the database.
+    """
+
+    __slots__ = ("states", "last_updated_ts", "last_changed_ts", "complete_after_ts")
+
+    def __init__(self, complete_after_ts: float) -> None:
+        """Initialize the recent states of an entity."""
+        self.states: list[str | None] = []
+        self.last_updated_ts = array("d")
+        self.last_changed_ts = array("d")
+        self.complete_after_ts = complete_after_ts
+
+    def add(
+        self, state: str | None, last_updated_ts: float, last_changed_ts: float
+    ) -> None:
+        """Add a state keeping the states sorted."""
+        if not self.last_updated_ts or last_updated_ts >= self.last_updated_ts[-1]:
+            self.states.append(state)
+            self.last_updated_ts.append(last_updated_ts)
+            self.last_changed_ts.append(last_changed_ts)
+        else:
+            idx = bisect_right(self.last_updated_ts, last_updated_ts)
+            self.states.insert(idx, state)
+            self.last_updated_ts.insert(idx, last_updated_ts)
+            self.last_changed_ts.insert(idx, last_changed_ts)
+        if len(self.states) > MAX_STATES_PER_ENTITY:
+            self.complete_after_ts = self.last_updated_ts[EVICT_STATES - 1]
+            self.drop_before(EVICT_STATES)
+
+    def drop_before(self, idx: int) -> None:
+        """Drop the states before an index."""
+        del self.states[:idx]
+        del self.last_updated_ts[:idx]
+        del self.last_changed_ts[:idx]
+
+
+class RecentStatesCache:
+    """Cache the states the recorder wrote during the current run.
+
+    The states are added by the recorder thread as they are written
+    and read by the history queries in the executor, so all access
+    is guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._lock = threading.Lock()
+        self._entities: dict[str, _RecentEntityStates] = {}
+        self._start_ts: float | None = None
+
+    def start(self, run_start_ts: float) -> None:
+        """Start caching the states recorded since the start of a run."""
+        with self._lock:
+            self._entities.clear()
+            self._start_ts = run_start_ts
+
+    def add(
+        self,
+        entity_id: str,
+        state: str | None,
+        last_updated_ts: float,
+        last_changed_ts: float | None,
+    ) -> None:
+        """Add a state that was written to the database."""
+        with self._lock:
+            if self._start_ts is None:
+                return
+            if (recent := self._entities.get(entity_id)) is None:
+                recent = self._entities[entity_id] = _RecentEntityStates(self._start_ts)
+            recent.add(state, last_updated_ts, last_changed_ts or 0.0)
+
+    def purge(
+        self, purge_before_ts: float, entity_filter: Callable[[str], bool] | None
+    ) -> None:
+        """Drop the states the purge deletes from the database."""
+        with self._lock:
+            for entity_id, recent in self._entities.items():
+                if entity_filter is None or entity_filter(entity_id):
+                    recent.drop_before(
+                        bisect_left(recent.last_updated_ts, purge_before_ts)
+                    )
+
+    def purge_entities(self, entity_filter: Callable[[str], bool]) -> None:
+        """Drop all the states of the entities the purge deletes from the database."""
+        with self._lock:
+            for entity_id in [eid for eid in self._entities if entity_filter(eid)]:
+                del self._entities[entity_id]
+
+    def significant_states(
+        self,
+        start_time_ts: float,
+        end_time_ts: float | None,
+        entity_ids: Iterable[str],
+        run_start_ts: float | None,
+        significant_changes_only: bool,
+        minimal_response: bool,
+    ) -> dict[str, list[dict[str, Any]]] | None:
+        """Return the compressed significant states without attributes.
+
+        This matches what get_significant_states returns from the database
+        with no_attributes and compressed_state_format set. run_start_ts is
+        the start of the run when the start time states are included.
+
+        Returns None if any of the entities has states that are not cached.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        rows_by_entity_id: dict[str, list[tuple[str | None, float, float]]] = {}
+        with self._lock:
+            if self._start_ts is None:
+                return None
+            for entity_id in entity_ids:
+                if (
+                    rows := self._entity_rows(
+                        entity_id,
+                        start_time_ts,
+                        end_time_ts,
+                        run_start_ts,
+                        len(entity_ids) == 1,
+                        significant_changes_only,
+                    )
+                ) is None:
+                    return None
+                if rows:
+                    rows_by_entity_id[entity_id] = rows
+
+        return {
+            entity_id: _compressed_states(
+                rows,
+                not minimal_response
+                or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS,
+                not significant_changes_only,
+            )
+            for entity_id, rows in rows_by_entity_id.items()
+        }
+
+    def _entity_rows(
+        self,
+        entity_id: str,
+        start_time_ts: float,
+        end_time_ts: float | None,
+        run_start_ts: float | None,
+        single_entity: bool,
+        significant_changes_only: bool,
+    ) -> list[tuple[str | None, float, float]] | None:
+        """Return the rows of an entity or None if they are not all cached."""
+        assert self._start_ts is not None
+        if (recent := self._entities.get(entity_id)) is None:
+            recent = _RecentEntityStates(self._start_ts)
+        complete_after_ts = recent.complete_after_ts
+        if start_time_ts < complete_after_ts:
+            return None
+
+        states = recent.states
+        last_updated_ts = recent.last_updated_ts
+        last_changed_ts = recent.last_changed_ts
+        start_idx = bisect_right(last_updated_ts, start_time_ts)
+        rows: list[tuple[str | None, float, float]] = []
+
+        if run_start_ts is not None:
+            # The start time state is the last state before the start
+            # time. The database only looks for it in the current run
+            # when there is more than one entity.
+            before_idx = bisect_left(last_updated_ts, start_time_ts) - 1
+            if before_idx >= 0 and (
+                single_entity or last_updated_ts[before_idx] >= run_start_ts
+            ):
+                if last_updated_ts[before_idx] < complete_after_ts:
+                    return None
+                rows.append((states[before_idx], start_time_ts, 0.0))
+            elif single_entity or complete_after_ts > run_start_ts:
+                return None
+
+        end_idx = (
+            bisect_left(last_updated_ts, end_time_ts, start_idx)
+            if end_time_ts
+            else len(states)
+        )
+        only_state_changes = (
+            significant_changes_only
+            and split_entity_id(entity_id)[0] not in SIGNIFICANT_DOMAINS
+        )
+        for idx in range(start_idx, end_idx):
+            changed_ts = last_changed_ts[idx]
+            updated_ts = last_updated_ts[idx]
+            if only_state_changes and changed_ts and changed_ts != updated_ts:
+                continue
+            rows.append((states[idx], updated_ts, changed_ts))
+        return rows
+
+
+def _compressed_states(
+    rows: list[tuple[str | None, float, float]],
+    full_states: bool,
+    include_last_changed: bool,
+) -> list[dict[str, Any]]:
+    """Convert rows to compressed states the same way as _sorted_states_to_dict."""
+    compressed: list[dict[str, Any]] = []
+    if not full_states:
+        # With minimal response only the first state is a
+        # full state and the other states are only included
+        # when the state changes
+        first_state, last_updated_ts, last_changed_ts = rows[0]
+        comp_state: dict[str, Any] = {
+            COMPRESSED_STATE_STATE: first_state,
+            COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+        }
+        if (
+            include_last_changed
+            and last_changed_ts
+            and (last_changed_ts != last_updated_ts)
+        ):
+            comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+        compressed.append(comp_state)
+        prev_state = first_state
+        for state, last_updated_ts, _ in rows[1:]:
+            if state != prev_state:
+                compressed.append(
+                    {
+                        COMPRESSED_STATE_STATE: state,
+                        COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+                    }
+                )
+                prev_state = state
+        return compressed
+
+    for state, last_updated_ts, last_changed_ts in rows:
+        comp_state = {
+            COMPRESSED_STATE_STATE: state,
+            COMPRESSED_STATE_ATTRIBUTES: {},
+            COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+        }
+        if (
+            include_last_changed
+            and last_changed_ts
+            and (last_changed_ts != last_updated_ts)
+        ):
+            comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+        compressed.append(comp_state)
+    return compressed
@@ -1064,6 +1064,21 @@ def _apply_update(  # noqa: C901
     elif new_version == 41:
         _create_index(session_maker, "event_types", "ix_event_types_event_type")
         _create_index(session_maker, "states_meta", "ix_states_meta_entity_id")
+    elif new_version == 42:
+        _add_columns(
+            session_maker,
+            "state_attributes",
+            [f"last_used_ts {_column_types.timestamp_type}"],
+        )
+        _create_index(
+            session_maker, "state_attributes", "ix_state_attributes_last_used_ts"
+        )
+        _add_columns(
+            session_maker,
+            "event_data",
+            [f"last_used_ts {_column_types.timestamp_type}"],
+        )
+        _create_index(session_maker, "event_data", "ix_event_data_last_used_ts")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1,18 +1,23 @@
 """Purge old data helper."""
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from datetime import datetime
 from itertools import zip_longest
 import logging
 import time
 from typing import TYPE_CHECKING
 
+from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
 
 import homeassistant.util.dt as dt_util
 
-from .const import SQLITE_MAX_BIND_VARS
+from .const import (
+    LAST_USED_TS_INTERVAL,
+    LAST_USED_TS_SCHEMA_VERSION,
+    SQLITE_MAX_BIND_VARS,
+)
 from .db_schema import Events, States, StatesMeta
 from .models import DatabaseEngine
 from .queries import (
@@ -22,14 +27,21 @@ from .queries import (
     data_ids_exist_in_events_with_fast_in_distinct,
     delete_event_data_rows,
     delete_event_rows,
+    delete_event_rows_before,
     delete_event_types_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
     delete_states_meta_rows,
     delete_states_rows,
+    delete_states_rows_before,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    disconnect_states_rows_before,
+    find_attributes_ids_last_used_before,
+    find_attributes_last_used_ts,
+    find_data_ids_last_used_before,
+    find_data_last_used_ts,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
@@ -189,17 +201,46 @@ def _purge_states_and_attributes_ids(
     # size batch of attributes_ids that will be around the size
     # SQLITE_MAX_BIND_VARS
     attributes_ids_batch: set[int] = set()
+    # Every state last updated before purged_before_ts has been deleted
+    purged_before_ts: float | None = None
     for _ in range(states_batch_size):
-        state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
-            session, purge_before
-        )
+        (
+            state_ids,
+            attributes_ids,
+            purge_range_end,
+        ) = _select_state_attributes_ids_to_purge(session, purge_before)
         if not state_ids:
             has_remaining_state_ids_to_purge = False
             break
-        _purge_state_ids(instance, session, state_ids)
+        if purge_range_end is None:
+            _purge_state_ids(instance, session, state_ids)
+        else:
+            _purge_states_before(instance, session, state_ids, purge_range_end)
+            purged_before_ts = purge_range_end
         attributes_ids_batch = attributes_ids_batch | attributes_ids
 
-    _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
+    if instance.schema_version < LAST_USED_TS_SCHEMA_VERSION:
+        _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
+    else:
+        purge_before_ts = dt_util.utc_to_timestamp(purge_before)
+        if not has_remaining_state_ids_to_purge:
+            purged_before_ts = purge_before_ts
+        unused_before_ts = (
+            None
+            if purged_before_ts is None
+            else purged_before_ts - LAST_USED_TS_INTERVAL
+        )
+        _purge_unused_attributes_ids(
+            instance,
+            session,
+            _select_attributes_ids_maybe_used(
+                session, attributes_ids_batch, unused_before_ts, purge_before_ts
+            ),
+        )
+        if unused_before_ts is not None:
+            has_remaining_state_ids_to_purge |= _purge_attributes_ids_last_used_before(
+                instance, session, states_batch_size, unused_before_ts
+            )
     _LOGGER.debug(
         "After purging states and attributes_ids remaining=%s",
         has_remaining_state_ids_to_purge,
@@ -223,15 +264,44 @@ def _purge_events_and_data_ids(
     # size batch of data_ids that will be around the size
     # SQLITE_MAX_BIND_VARS
     data_ids_batch: set[int] = set()
+    # Every event fired before purged_before_ts has been deleted
+    purged_before_ts: float | None = None
     for _ in range(events_batch_size):
-        event_ids, data_ids = _select_event_data_ids_to_purge(session, purge_before)
+        event_ids, data_ids, purge_range_end = _select_event_data_ids_to_purge(
+            session, purge_before
+        )
         if not event_ids:
             has_remaining_event_ids_to_purge = False
             break
-        _purge_event_ids(session, event_ids)
+        if purge_range_end is None:
+            _purge_event_ids(session, event_ids)
+        else:
+            _purge_events_before(session, purge_range_end)
+            purged_before_ts = purge_range_end
         data_ids_batch = data_ids_batch | data_ids
 
-    _purge_unused_data_ids(instance, session, data_ids_batch)
+    if instance.schema_version < LAST_USED_TS_SCHEMA_VERSION:
+        _purge_unused_data_ids(instance, session, data_ids_batch)
+    else:
+        purge_before_ts = dt_util.utc_to_timestamp(purge_before)
+        if not has_remaining_event_ids_to_purge:
+            purged_before_ts = purge_before_ts
+        unused_before_ts = (
+            None
+            if purged_before_ts is None
+            else purged_before_ts - LAST_USED_TS_INTERVAL
+        )
+        _purge_unused_data_ids(
+            instance,
+            session,
+            _select_data_ids_maybe_used(
+                session, data_ids_batch, unused_before_ts, purge_before_ts
+            ),
+        )
+        if unused_before_ts is not None:
+            has_remaining_event_ids_to_purge |= _purge_data_ids_last_used_before(
+                instance, session, events_batch_size, unused_before_ts
+            )
     _LOGGER.debug(
         "After purging event and data_ids remaining=%s",
         has_remaining_event_ids_to_purge,
@@ -239,15 +309,43 @@ def _purge_events_and_data_ids(
     return has_remaining_event_ids_to_purge
 
 
+def _purge_range_end(
+    rows: Sequence[Row], purge_before_ts: float
+) -> tuple[Sequence[Row], float | None]:
+    """Return the oldest rows that can be deleted by range and the end of the range.
+
+    The rows are sorted by their timestamp, which is the last column. If
+    the query was not limited every row before purge_before_ts was selected.
+    Otherwise rows sharing the timestamp of the last row may have been left
+    out, so the range ends at that timestamp and those rows are left for the
+    next batch. When all the rows share a timestamp there is no range and
+    the rows have to be deleted by id.
+    """
+    if len(rows) < SQLITE_MAX_BIND_VARS:
+        return rows, purge_before_ts
+    last_ts = rows[-1][-1]
+    if rows[0][-1] == last_ts:
+        return rows, None
+    return [row for row in rows if row[-1] < last_ts], last_ts
+
+
 def _select_state_attributes_ids_to_purge(
     session: Session, purge_before: datetime
-) -> tuple[set[int], set[int]]:
-    """Return sets of state and attribute ids to purge."""
+) -> tuple[set[int], set[int], float | None]:
+    """Return sets of state and attribute ids to purge and the end of their range.
+
+    Every state last updated before the end of the range is in the set of
+    state ids. The end of the range is None if the states have to be
+    deleted by id.
+    """
+    purge_before_ts = dt_util.utc_to_timestamp(purge_before)
+    rows, purge_range_end = _purge_range_end(
+        session.execute(find_states_to_purge(purge_before_ts)).all(),
+        purge_before_ts,
+    )
     state_ids = set()
     attributes_ids = set()
-    for state_id, attributes_id in session.execute(
-        find_states_to_purge(dt_util.utc_to_timestamp(purge_before))
-    ).all():
+    for state_id, attributes_id, _ in rows:
         state_ids.add(state_id)
         if attributes_id:
             attributes_ids.add(attributes_id)
@@ -256,25 +354,134 @@ def _select_state_attributes_ids_to_purge(
         len(state_ids),
         len(attributes_ids),
     )
-    return state_ids, attributes_ids
+    return state_ids, attributes_ids, purge_range_end
 
 
 def _select_event_data_ids_to_purge(
     session: Session, purge_before: datetime
-) -> tuple[set[int], set[int]]:
-    """Return sets of event and data ids to purge."""
+) -> tuple[set[int], set[int], float | None]:
+    """Return sets of event and data ids to purge and the end of their range.
+
+    Every event fired before the end of the range is in the set of
+    event ids. The end of the range is None if the events have to be
+    deleted by id.
+    """
+    purge_before_ts = dt_util.utc_to_timestamp(purge_before)
+    rows, purge_range_end = _purge_range_end(
+        session.execute(find_events_to_purge(purge_before_ts)).all(),
+        purge_before_ts,
+    )
     event_ids = set()
     data_ids = set()
-    for event_id, data_id in session.execute(
-        find_events_to_purge(dt_util.utc_to_timestamp(purge_before))
-    ).all():
+    for event_id, data_id, _ in rows:
         event_ids.add(event_id)
         if data_id:
             data_ids.add(data_id)
     _LOGGER.debug(
         "Selected %s event ids and %s data_ids to remove", len(event_ids), len(data_ids)
     )
-    return event_ids, data_ids
+    return event_ids, data_ids, purge_range_end
+
+
+def _is_maybe_used(
+    last_used_ts: float | None, unused_before_ts: float | None, purge_before_ts: float
+) -> bool:
+    """Return if a row has to be searched for to know if it is still used.
+
+    The last_used_ts of a row is less than LAST_USED_TS_INTERVAL older than
+    the newest row using it, so once every row before a timestamp has been
+    purged the rows last used more than that interval before it are unused.
+    Rows last used after purge_before_ts are used, or are left for a later
+    purge to find.
+    """
+    return last_used_ts is None or (
+        (unused_before_ts is None or last_used_ts >= unused_before_ts)
+        and last_used_ts < purge_before_ts
+    )
+
+
+def _select_attributes_ids_maybe_used(
+    session: Session,
+    attributes_ids: set[int],
+    unused_before_ts: float | None,
+    purge_before_ts: float,
+) -> set[int]:
+    """Return the attributes ids of purged states that may still be used.
+
+    The attributes last used before unused_before_ts are deleted by
+    _purge_attributes_ids_last_used_before without searching the states.
+    """
+    maybe_used_ids: set[int] = set()
+    for attributes_ids_chunk in chunked(attributes_ids, SQLITE_MAX_BIND_VARS):
+        for attributes_id, last_used_ts in session.execute(
+            find_attributes_last_used_ts(attributes_ids_chunk)
+        ):
+            if _is_maybe_used(last_used_ts, unused_before_ts, purge_before_ts):
+                maybe_used_ids.add(attributes_id)
+    return maybe_used_ids
+
+
+def _select_data_ids_maybe_used(
+    session: Session,
+    data_ids: set[int],
+    unused_before_ts: float | None,
+    purge_before_ts: float,
+) -> set[int]:
+    """Return the data ids of purged events that may still be used.
+
+    The event data last used before unused_before_ts are deleted by
+    _purge_data_ids_last_used_before without searching the events.
+    """
+    maybe_used_ids: set[int] = set()
+    for data_ids_chunk in chunked(data_ids, SQLITE_MAX_BIND_VARS):
+        for data_id, last_used_ts in session.execute(
+            find_data_last_used_ts(data_ids_chunk)
+        ):
+            if _is_maybe_used(last_used_ts, unused_before_ts, purge_before_ts):
+                maybe_used_ids.add(data_id)
+    return maybe_used_ids
+
+
+def _purge_attributes_ids_last_used_before(
+    instance: Recorder, session: Session, batches: int, last_used_before_ts: float
+) -> bool:
+    """Purge attributes last used before a timestamp in batches.
+
+    Returns true if there are more attributes to purge.
+    """
+    for _ in range(batches):
+        if not (
+            attributes_ids := set(
+                session.execute(
+                    find_attributes_ids_last_used_before(last_used_before_ts)
+                ).scalars()
+            )
+        ):
+            return False
+        _LOGGER.debug("Selected %s unused attributes to remove", len(attributes_ids))
+        _purge_batch_attributes_ids(instance, session, attributes_ids)
+    return True
+
+
+def _purge_data_ids_last_used_before(
+    instance: Recorder, session: Session, batches: int, last_used_before_ts: float
+) -> bool:
+    """Purge event data last used before a timestamp in batches.
+
+    Returns true if there is more event data to purge.
+    """
+    for _ in range(batches):
+        if not (
+            data_ids := set(
+                session.execute(
+                    find_data_ids_last_used_before(last_used_before_ts)
+                ).scalars()
+            )
+        ):
+            return False
+        _LOGGER.debug("Selected %s unused event data to remove", len(data_ids))
+        _purge_batch_data_ids(instance, session, data_ids)
+    return True
 
 
 def _select_unused_attributes_ids(
@@ -508,6 +715,29 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     instance.states_manager.evict_purged_state_ids(state_ids)
 
 
+def _purge_states_before(
+    instance: Recorder, session: Session, state_ids: set[int], purge_before: float
+) -> None:
+    """Disconnect and delete the states last updated before a timestamp.
+
+    Deleting by range lets the database use the last_updated_ts index
+    instead of matching every row against a list of ids. state_ids are
+    the ids of the deleted states.
+    """
+    # Update old_state_id to NULL before deleting to ensure
+    # the delete does not fail due to a foreign key constraint
+    # since some databases (MSSQL) cannot do the ON DELETE SET NULL
+    # for us.
+    disconnected_rows = session.execute(disconnect_states_rows_before(purge_before))
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+
+    deleted_rows = session.execute(delete_states_rows_before(purge_before))
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+
+    # Evict eny entries in the old_states cache referring to a purged state
+    instance.states_manager.evict_purged_state_ids(state_ids)
+
+
 def _purge_batch_attributes_ids(
     instance: Recorder, session: Session, attributes_ids: set[int]
 ) -> None:
@@ -558,6 +788,12 @@ def _purge_event_ids(session: Session, event_ids: set[int]) -> None:
     _LOGGER.debug("Deleted %s events", deleted_rows)
 
 
+def _purge_events_before(session: Session, purge_before: float) -> None:
+    """Delete the events fired before a timestamp."""
+    deleted_rows = session.execute(delete_event_rows_before(purge_before))
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+
+
 def _purge_old_recorder_runs(
     instance: Recorder, session: Session, purge_before: datetime
 ) -> None:
@@ -4,7 +4,18 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    bindparam,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.sql.dml import Update
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -542,6 +553,36 @@ def disconnect_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def disconnect_states_rows_before(purge_before: float) -> StatementLambdaElement:
+    """Disconnect states rows from the states last updated before a timestamp."""
+    # The state_ids are selected from a derived table since MySQL
+    # does not allow a subquery on the table that is being updated
+    return lambda_stmt(
+        lambda: update(States)
+        .where(
+            States.old_state_id.in_(
+                select(
+                    select(States.state_id)
+                    .filter(States.last_updated_ts < purge_before)
+                    .subquery()
+                    .c.state_id
+                )
+            )
+        )
+        .values(old_state_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_rows_before(purge_before: float) -> StatementLambdaElement:
+    """Delete states rows last updated before a timestamp."""
+    return lambda_stmt(
+        lambda: delete(States)
+        .where(States.last_updated_ts < purge_before)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete states rows."""
     return lambda_stmt(
@@ -604,6 +645,15 @@ def delete_event_rows(
     )
 
 
+def delete_event_rows_before(purge_before: float) -> StatementLambdaElement:
+    """Delete events rows fired before a timestamp."""
+    return lambda_stmt(
+        lambda: delete(Events)
+        .where(Events.time_fired_ts < purge_before)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_recorder_runs_rows(
     purge_before: datetime, current_run_id: int
 ) -> StatementLambdaElement:
@@ -617,23 +667,105 @@ def delete_recorder_runs_rows(
 
 
 def find_events_to_purge(purge_before: float) -> StatementLambdaElement:
-    """Find events to purge."""
+    """Find the oldest events to purge."""
     return lambda_stmt(
-        lambda: select(Events.event_id, Events.data_id)
+        lambda: select(Events.event_id, Events.data_id, Events.time_fired_ts)
         .filter(Events.time_fired_ts < purge_before)
+        .order_by(Events.time_fired_ts)
         .limit(SQLITE_MAX_BIND_VARS)
     )
 
 
 def find_states_to_purge(purge_before: float) -> StatementLambdaElement:
-    """Find states to purge."""
+    """Find the oldest states to purge."""
     return lambda_stmt(
-        lambda: select(States.state_id, States.attributes_id)
+        lambda: select(States.state_id, States.attributes_id, States.last_updated_ts)
         .filter(States.last_updated_ts < purge_before)
+        .order_by(States.last_updated_ts)
         .limit(SQLITE_MAX_BIND_VARS)
     )
 
 
+def find_attributes_ids_last_used_before(
+    last_used_before: float,
+) -> StatementLambdaElement:
+    """Find state_attributes rows last used before a timestamp."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .filter(StateAttributes.last_used_ts < last_used_before)
+        .limit(SQLITE_MAX_BIND_VARS)
+    )
+
+
+def find_data_ids_last_used_before(
+    last_used_before: float,
+) -> StatementLambdaElement:
+    """Find event_data rows last used before a timestamp."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id)
+        .filter(EventData.last_used_ts < last_used_before)
+        .limit(SQLITE_MAX_BIND_VARS)
+    )
+
+
+def find_attributes_last_used_ts(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Find the last_used_ts of state_attributes rows."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.last_used_ts
+        ).where(StateAttributes.attributes_id.in_(attributes_ids))
+    )
+
+
+def find_data_last_used_ts(data_ids: Iterable[int]) -> StatementLambdaElement:
+    """Find the last_used_ts of event_data rows."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.last_used_ts).where(
+            EventData.data_id.in_(data_ids)
+        )
+    )
+
+
+def update_attributes_last_used_ts() -> Update:
+    """Update the last_used_ts of state_attributes rows unless it is newer.
+
+    This query is intentionally not a lambda statement as it is
+    executed with many parameters on the connection.
+    """
+    return (
+        update(StateAttributes)
+        .where(StateAttributes.attributes_id == bindparam("b_id"))
+        .where(
+            or_(
+                StateAttributes.last_used_ts.is_(None),
+                StateAttributes.last_used_ts < bindparam("b_last_used_ts"),
+            )
+        )
+        .values(last_used_ts=bindparam("b_last_used_ts"))
+    )
+
+
+def update_data_last_used_ts() -> Update:
+    """Update the last_used_ts of event_data rows unless it is newer.
+
+    This query is intentionally not a lambda statement as it is
+    executed with many parameters on the connection.
+    """
+    return (
+        update(EventData)
+        .where(EventData.data_id == bindparam("b_id"))
+        .where(
+            or_(
+                EventData.last_used_ts.is_(None),
+                EventData.last_used_ts < bindparam("b_last_used_ts"),
+            )
+        )
+        .values(last_used_ts=bindparam("b_last_used_ts"))
+    )
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime,
 ) -> StatementLambdaElement:
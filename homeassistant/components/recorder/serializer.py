@@ -0,0 +1,105 @@
+"""Serialize recorder events ahead of the recorder thread."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from .const import SupportedDialect
+from .db_schema import EventData, StateAttributes
+
+if TYPE_CHECKING:
+    from .core import Recorder
+    from .tasks import EventTask
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SerializedEvent(NamedTuple):
+    """The serialized data or attributes of an event and their hash."""
+
+    dialect: SupportedDialect | None
+    shared_bytes: bytes | None
+    hash: int | None
+
+
+def serialize_event_task(instance: Recorder, task: EventTask) -> SerializedEvent:
+    """Serialize the event of a task unless it was already serialized.
+
+    The result is stored on the task so the work is only done once,
+    by whichever thread gets to the task first. A result serialized
+    for another dialect is ignored since the encoding depends on it.
+    """
+    dialect_name = instance.dialect_name
+    if (serialized := task.serialized) is not None and (
+        serialized.dialect == dialect_name
+    ):
+        return serialized
+    event = task.event
+    shared_bytes: bytes | None = None
+    hash_: int | None = None
+    if event.event_type == EVENT_STATE_CHANGED:
+        if event.data["entity_id"] is not None and (
+            shared_bytes := instance.state_attributes_manager.serialize_from_event(
+                event
+            )
+        ):
+            hash_ = StateAttributes.hash_shared_attrs_bytes(shared_bytes)
+    elif event.data and (
+        shared_bytes := instance.event_data_manager.serialize_from_event(event)
+    ):
+        hash_ = EventData.hash_shared_data_bytes(shared_bytes)
+    task.serialized = serialized = SerializedEvent(dialect_name, shared_bytes, hash_)
+    return serialized
+
+
+class RecorderSerializer(threading.Thread):
+    """Serialize and hash events before the recorder thread needs them.
+
+    Every event task is queued here as well as on the recorder queue
+    so the recorder thread keeps processing tasks in order and only has
+    to serialize the events this thread has not reached yet.
+    """
+
+    def __init__(self, instance: Recorder) -> None:
+        """Initialize the serializer."""
+        threading.Thread.__init__(self, name="Recorder serializer", daemon=True)
+        self._instance = instance
+        self._queue: queue.SimpleQueue[EventTask | None] = queue.SimpleQueue()
+
+    @property
+    def backlog(self) -> int:
+        """Return the number of events waiting to be serialized."""
+        return self._queue.qsize()
+
+    def queue_task(self, task: EventTask) -> None:
+        """Add an event task to the serializer queue."""
+        self._queue.put(task)
+
+    def clear(self) -> None:
+        """Drop the events waiting to be serialized."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def stop(self) -> None:
+        """Stop the serializer thread and wait for it to finish."""
+        if not self.is_alive():
+            return
+        self._queue.put(None)
+        self.join()
+
+    def run(self) -> None:
+        """Serialize events until the serializer is stopped."""
+        instance = self._instance
+        queue_ = self._queue
+        while (task := queue_.get()) is not None:
+            try:
+                serialize_event_task(instance, task)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while serializing event %s", task.event)
@@ -7,14 +7,22 @@ import contextlib
 import dataclasses
 from datetime import datetime, timedelta
 from functools import lru_cache, partial
-from itertools import chain, groupby
+from itertools import groupby
 import logging
 from operator import itemgetter
 import re
-from statistics import mean
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import (
+    Select,
+    and_,
+    bindparam,
+    case,
+    func,
+    lambda_stmt,
+    select,
+    text,
+)
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError, StatementError
 from sqlalchemy.orm.session import Session
@@ -125,6 +133,10 @@ QUERY_STATISTICS_SUMMARY_SUM = (
     .label("rownum"),
 )
 
+# The number of periods reduced by a single query, the boundaries
+# of the periods are bound parameters of the query
+MAX_PERIODS_PER_REDUCE_QUERY = 100
+
 
 STATISTIC_UNIT_TO_UNIT_CONVERTER: dict[str | None, type[BaseUnitConverter]] = {
     **{unit: DataRateConverter for unit in DataRateConverter.VALID_UNITS},
@@ -808,65 +820,6 @@ def list_statistic_ids(
     return _flatten_list_statistic_ids_metadata_result(result)
 
 
-def _reduce_statistics(
-    stats: dict[str, list[StatisticsRow]],
-    same_period: Callable[[float, float], bool],
-    period_start_end: Callable[[float], tuple[float, float]],
-    period: timedelta,
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
-    result: dict[str, list[StatisticsRow]] = defaultdict(list)
-    period_seconds = period.total_seconds()
-    _want_mean = "mean" in types
-    _want_min = "min" in types
-    _want_max = "max" in types
-    _want_last_reset = "last_reset" in types
-    _want_state = "state" in types
-    _want_sum = "sum" in types
-    for statistic_id, stat_list in stats.items():
-        max_values: list[float] = []
-        mean_values: list[float] = []
-        min_values: list[float] = []
-        prev_stat: StatisticsRow = stat_list[0]
-        fake_entry: StatisticsRow = {"start": stat_list[-1]["start"] + period_seconds}
-
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(stat_list, (fake_entry,)):
-            if not same_period(prev_stat["start"], statistic["start"]):
-                start, end = period_start_end(prev_stat["start"])
-                # The previous statistic was the last entry of the period
-                row: StatisticsRow = {
-                    "start": start,
-                    "end": end,
-                }
-                if _want_mean:
-                    row["mean"] = mean(mean_values) if mean_values else None
-                    mean_values.clear()
-                if _want_min:
-                    row["min"] = min(min_values) if min_values else None
-                    min_values.clear()
-                if _want_max:
-                    row["max"] = max(max_values) if max_values else None
-                    max_values.clear()
-                if _want_last_reset:
-                    row["last_reset"] = prev_stat.get("last_reset")
-                if _want_state:
-                    row["state"] = prev_stat.get("state")
-                if _want_sum:
-                    row["sum"] = prev_stat["sum"]
-                result[statistic_id].append(row)
-            if _want_max and (_max := statistic.get("max")) is not None:
-                max_values.append(_max)
-            if _want_mean and (_mean := statistic.get("mean")) is not None:
-                mean_values.append(_mean)
-            if _want_min and (_min := statistic.get("min")) is not None:
-                min_values.append(_min)
-            prev_stat = statistic
-
-    return result
-
-
 def reduce_day_ts_factory() -> (
     tuple[
         Callable[[float, float], bool],
@@ -904,17 +857,6 @@ def reduce_day_ts_factory() -> (
     return _same_day_ts, _day_start_end_ts_cached
 
 
-def _reduce_statistics_per_day(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily statistics."""
-    _same_day_ts, _day_start_end_ts = reduce_day_ts_factory()
-    return _reduce_statistics(
-        stats, _same_day_ts, _day_start_end_ts, timedelta(days=1), types
-    )
-
-
 def reduce_week_ts_factory() -> (
     tuple[
         Callable[[float, float], bool],
@@ -954,17 +896,6 @@ def reduce_week_ts_factory() -> (
     return _same_week_ts, _week_start_end_ts_cached
 
 
-def _reduce_statistics_per_week(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to weekly statistics."""
-    _same_week_ts, _week_start_end_ts = reduce_week_ts_factory()
-    return _reduce_statistics(
-        stats, _same_week_ts, _week_start_end_ts, timedelta(days=7), types
-    )
-
-
 def _find_month_end_time(timestamp: datetime) -> datetime:
     """Return the end of the month (midnight at the first day of the next month)."""
     # We add 4 days to the end to make sure we are in the next month
@@ -1011,15 +942,155 @@ def reduce_month_ts_factory() -> (
     return _same_month_ts, _month_start_end_ts_cached
 
 
-def _reduce_statistics_per_month(
-    stats: dict[str, list[StatisticsRow]],
+def _period_start_end_ts_factory(
+    period: Literal["5minute", "day", "hour", "week", "month"]
+) -> Callable[[float], tuple[float, float]] | None:
+    """Return a function to find the start and end of the period time is within.
+
+    Returns None for the periods which are stored in the database.
+    """
+    if period == "day":
+        return reduce_day_ts_factory()[1]
+    if period == "week":
+        return reduce_week_ts_factory()[1]
+    if period == "month":
+        return reduce_month_ts_factory()[1]
+    return None
+
+
+def _generate_reduce_statistics_stmt(
+    periods: list[tuple[float, float]],
+    first_period_idx: int,
+    metadata_ids: list[int] | None,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to monthly statistics."""
-    _same_month_ts, _month_start_end_ts = reduce_month_ts_factory()
-    return _reduce_statistics(
-        stats, _same_month_ts, _month_start_end_ts, timedelta(days=31), types
+) -> Select:
+    """Generate a statement to reduce hourly statistics to consecutive periods.
+
+    Every hourly row is tagged with the index of its period and the
+    database returns one row per statistic and period with the mean,
+    min and max over the period and the last_reset, state and sum of
+    the last hourly row of the period.
+
+    The period index is selected as start_ts so the rows can be converted
+    by _sorted_statistics_to_dict, the caller replaces it with the start
+    of the period.
+    """
+    period_idx = case(
+        *(
+            (Statistics.start_ts < end_ts, first_period_idx + idx)
+            for idx, (_, end_ts) in enumerate(periods)
+        )
+    )
+    hourly_stmt = (
+        select(
+            Statistics.metadata_id,
+            Statistics.start_ts,
+            period_idx.label("period_idx"),
+            *(getattr(Statistics, _type_column_mapping[key]) for key in types),
+        )
+        .filter(Statistics.start_ts >= periods[0][0])
+        .filter(Statistics.start_ts < periods[-1][1])
+    )
+    if metadata_ids:
+        hourly_stmt = hourly_stmt.filter(Statistics.metadata_id.in_(metadata_ids))
+    hourly = hourly_stmt.subquery()
+    partition_by = (hourly.c.metadata_id, hourly.c.period_idx)
+    columns: list[Any] = [
+        hourly.c.metadata_id,
+        hourly.c.period_idx.label("start_ts"),
+    ]
+    if "mean" in types:
+        columns.append(
+            func.avg(hourly.c.mean)
+            .over(partition_by=partition_by)  # type: ignore[no-untyped-call]
+            .label("mean")
+        )
+    if "min" in types:
+        columns.append(
+            func.min(hourly.c.min)
+            .over(partition_by=partition_by)  # type: ignore[no-untyped-call]
+            .label("min")
+        )
+    if "max" in types:
+        columns.append(
+            func.max(hourly.c.max)
+            .over(partition_by=partition_by)  # type: ignore[no-untyped-call]
+            .label("max")
+        )
+    for key in ("last_reset", "state", "sum"):
+        if key in types:
+            columns.append(hourly.c[_type_column_mapping[key]])
+    columns.append(
+        func.row_number()
+        .over(  # type: ignore[no-untyped-call]
+            partition_by=partition_by, order_by=hourly.c.start_ts.desc()
+        )
+        .label("rownum")
     )
+    reduced = select(*columns).subquery()
+    return (
+        select(*(column for column in reduced.c if column.name != "rownum"))
+        .filter(reduced.c.rownum == 1)
+        .order_by(reduced.c.metadata_id, reduced.c.start_ts)
+    )
+
+
+def _reduce_statistics_during_period(
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int] | None,
+    period_start_end: Callable[[float], tuple[float, float]],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> tuple[list[Row], list[tuple[float, float]]]:
+    """Reduce hourly statistics to daily, weekly or monthly statistics.
+
+    The periods depend on the configured time zone, so they are calculated
+    here and the hourly rows are reduced by the database instead of
+    fetching every hourly row.
+
+    Returns the reduced rows, sorted by metadata_id and tagged with the
+    index of their period, and the start and end of each period.
+    """
+    start_time_ts = start_time.timestamp()
+    if end_time is not None:
+        end_time_ts = end_time.timestamp()
+    else:
+        max_stmt = select(func.max(Statistics.start_ts)).filter(
+            Statistics.start_ts >= start_time_ts
+        )
+        if metadata_ids:
+            max_stmt = max_stmt.filter(Statistics.metadata_id.in_(metadata_ids))
+        if (max_start_ts := session.execute(max_stmt).scalar()) is None:
+            return [], []
+        end_time_ts = max_start_ts + Statistics.duration.total_seconds()
+
+    periods: list[tuple[float, float]] = []
+    period_start_ts = start_time_ts
+    while period_start_ts < end_time_ts:
+        periods.append(period_start_end(period_start_ts))
+        period_start_ts = periods[-1][1]
+
+    stats: list[Row] = []
+    for first_period_idx in range(0, len(periods), MAX_PERIODS_PER_REDUCE_QUERY):
+        stats.extend(
+            session.execute(
+                _generate_reduce_statistics_stmt(
+                    periods[
+                        first_period_idx : first_period_idx
+                        + MAX_PERIODS_PER_REDUCE_QUERY
+                    ],
+                    first_period_idx,
+                    metadata_ids,
+                    types,
+                )
+            )
+        )
+    if len(periods) > MAX_PERIODS_PER_REDUCE_QUERY:
+        # Each query returns its rows sorted by metadata_id, the sort is
+        # stable so the rows of each statistic stay sorted by period
+        stats.sort(key=itemgetter(0))
+    return stats, periods
 
 
 def _generate_statistics_during_period_stmt(
@@ -1653,12 +1724,18 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    periods: list[tuple[float, float]] | None = None
+    if (period_start_end := _period_start_end_ts_factory(period)) is not None:
+        stats, periods = _reduce_statistics_during_period(
+            session, start_time, end_time, metadata_ids, period_start_end, types
+        )
+    else:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            list[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
     if not stats:
         return {}
@@ -1676,14 +1753,11 @@ def _statistics_during_period_with_session(
         types,
     )
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
-
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
-
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+    if periods is not None:
+        # The reduced rows are tagged with the index of their period
+        for rows in result.values():
+            for row in rows:
+                row["start"], row["end"] = periods[int(row["start"])]
 
     if "change" in _types:
         _augment_result_with_change(
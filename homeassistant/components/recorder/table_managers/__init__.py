@@ -4,6 +4,10 @@ from collections.abc import MutableMapping
 from typing import TYPE_CHECKING, Generic, TypeVar
 
 from lru import LRU  # pylint: disable=no-name-in-module
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.dml import Update
+
+from ..const import LAST_USED_TS_INTERVAL, LAST_USED_TS_SCHEMA_VERSION
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -73,3 +77,78 @@ class BaseLRUTableManager(BaseTableManager[_DataT]):
         lru: LRU = self._id_map
         if new_size > lru.get_size():
             lru.set_size(new_size)
+
+
+class BaseLRUSharedTableManager(BaseLRUTableManager[_DataT]):
+    """Base class for LRU table managers of rows shared by many other rows.
+
+    The last time each row was used is written to the row so purge
+    can find the rows that are no longer used without searching the
+    table that refers to them.
+    """
+
+    def __init__(self, recorder: "Recorder", lru_size: int) -> None:
+        """Initialize the shared LRU table manager."""
+        super().__init__(recorder, lru_size)
+        self._last_used_ts: MutableMapping[int, float] = LRU(lru_size)
+        self._pending_last_used_ts: dict[int, float] = {}
+
+    @property
+    def tracks_last_used(self) -> bool:
+        """Return if the database schema has the last_used_ts column."""
+        return self.recorder.schema_version >= LAST_USED_TS_SCHEMA_VERSION
+
+    def mark_used(self, row_id: int, used_ts: float) -> None:
+        """Mark a committed row as used at a timestamp.
+
+        The timestamp is only written when it is at least
+        LAST_USED_TS_INTERVAL newer than the last timestamp
+        written for the row, or that timestamp is not known.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self.tracks_last_used or (
+            (last_used_ts := self._last_used_ts.get(row_id)) is not None
+            and used_ts < last_used_ts + LAST_USED_TS_INTERVAL
+        ):
+            return
+        pending = self._pending_last_used_ts
+        if (pending_ts := pending.get(row_id)) is None or used_ts > pending_ts:
+            pending[row_id] = used_ts
+
+    def _write_pending_last_used_ts(self, session: Session, stmt: Update) -> None:
+        """Write the pending last used timestamps with one executemany."""
+        if pending := self._pending_last_used_ts:
+            # The statement is executed on the connection since the
+            # ORM only runs UPDATE executemany statements by primary key
+            session.connection().execute(
+                stmt,
+                [
+                    {"b_id": row_id, "b_last_used_ts": used_ts}
+                    for row_id, used_ts in pending.items()
+                ],
+            )
+
+    def _post_commit_last_used_ts(self) -> None:
+        """Remember the last used timestamps that were committed."""
+        last_used_ts = self._last_used_ts
+        for row_id, used_ts in self._pending_last_used_ts.items():
+            last_used_ts[row_id] = used_ts
+        self._pending_last_used_ts.clear()
+
+    def _evict_purged_last_used_ts(self, row_ids: set[int]) -> None:
+        """Evict the last used timestamps of purged rows."""
+        last_used_ts = self._last_used_ts
+        for row_id in row_ids:
+            last_used_ts.pop(row_id, None)
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._last_used_ts.clear()
+        self._pending_last_used_ts.clear()
@@ -12,9 +12,9 @@ from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..const import SQLITE_MAX_BIND_VARS
 from ..db_schema import EventData
-from ..queries import get_shared_event_datas
+from ..queries import get_shared_event_datas, update_data_last_used_ts
 from ..util import chunked, execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseLRUSharedTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -25,7 +25,7 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class EventDataManager(BaseLRUTableManager[EventData]):
+class EventDataManager(BaseLRUSharedTableManager[EventData]):
     """Manage the EventData table."""
 
     def __init__(self, recorder: Recorder) -> None:
@@ -115,15 +115,39 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         shared_data: str = db_event_data.shared_data
         self._pending[shared_data] = db_event_data
 
+    def mark_pending_used(self, shared_data: str, used_ts: float) -> None:
+        """Mark a pending EventData as used at a timestamp.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self.tracks_last_used:
+            return
+        db_event_data = self._pending[shared_data]
+        if db_event_data.last_used_ts is None or db_event_data.last_used_ts < used_ts:
+            db_event_data.last_used_ts = used_ts
+
+    def write_pending_last_used_ts(self, session: Session) -> None:
+        """Write the last used timestamps of the committed EventData rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._write_pending_last_used_ts(session, update_data_last_used_ts())
+
     def post_commit_pending(self) -> None:
         """Call after commit to load the data_ids of the new EventData into the LRU.
 
         This call is not thread-safe and must be called from the
         recorder thread.
         """
+        tracks_last_used = self.tracks_last_used
         for shared_data, db_event_data in self._pending.items():
             self._id_map[shared_data] = db_event_data.data_id
+            if tracks_last_used and (last_used_ts := db_event_data.last_used_ts):
+                self._last_used_ts[db_event_data.data_id] = last_used_ts
         self._pending.clear()
+        self._post_commit_last_used_ts()
 
     def evict_purged(self, data_ids: set[int]) -> None:
         """Evict purged data_ids from the cache when they are no longer used.
@@ -138,3 +162,4 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         # Evict any purged data from the cache
         for purged_data_id in data_ids.intersection(event_data_ids_reversed):
             id_map.pop(event_data_ids_reversed[purged_data_id], None)
+        self._evict_purged_last_used_ts(data_ids)
@@ -13,9 +13,9 @@ from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..const import SQLITE_MAX_BIND_VARS
 from ..db_schema import StateAttributes
-from ..queries import get_shared_attributes
+from ..queries import get_shared_attributes, update_attributes_last_used_ts
 from ..util import chunked, execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseLRUSharedTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -31,7 +31,7 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
+class StateAttributesManager(BaseLRUSharedTableManager[StateAttributes]):
     """Manage the StateAttributes table."""
 
     def __init__(
@@ -132,15 +132,42 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         shared_attrs: str = db_state_attributes.shared_attrs
         self._pending[shared_attrs] = db_state_attributes
 
+    def mark_pending_used(self, shared_attrs: str, used_ts: float) -> None:
+        """Mark a pending StateAttributes as used at a timestamp.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self.tracks_last_used:
+            return
+        db_state_attributes = self._pending[shared_attrs]
+        if (
+            db_state_attributes.last_used_ts is None
+            or db_state_attributes.last_used_ts < used_ts
+        ):
+            db_state_attributes.last_used_ts = used_ts
+
+    def write_pending_last_used_ts(self, session: Session) -> None:
+        """Write the last used timestamps of the committed StateAttributes rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._write_pending_last_used_ts(session, update_attributes_last_used_ts())
+
     def post_commit_pending(self) -> None:
         """Call after commit to load the attributes_ids of the new StateAttributes into the LRU.
 
         This call is not thread-safe and must be called from the
         recorder thread.
         """
+        tracks_last_used = self.tracks_last_used
         for shared_attrs, db_state_attributes in self._pending.items():
             self._id_map[shared_attrs] = db_state_attributes.attributes_id
+            if tracks_last_used and (last_used_ts := db_state_attributes.last_used_ts):
+                self._last_used_ts[db_state_attributes.attributes_id] = last_used_ts
         self._pending.clear()
+        self._post_commit_last_used_ts()
 
     def evict_purged(self, attributes_ids: set[int]) -> None:
         """Evict purged attributes_ids from the cache when they are no longer used.
@@ -158,3 +185,4 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
             state_attributes_ids_reversed
         ):
             id_map.pop(state_attributes_ids_reversed[purged_attributes_id], None)
+        self._evict_purged_last_used_ts(attributes_ids)
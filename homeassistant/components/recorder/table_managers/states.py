@@ -1,7 +1,12 @@
 """Support managing States."""
 from __future__ import annotations
 
-from ..db_schema import States
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from ..db_schema import StateAttributes, States, StatesMeta
 
 
 class StatesManager:
@@ -11,6 +16,16 @@ class StatesManager:
         """Initialize the states manager for linking old_state_id."""
         self._pending: dict[str, States] = {}
         self._last_committed_id: dict[str, int] = {}
+        # Rows waiting to be inserted in bulk. The lists are indexed by the
+        # position of the row; references to pending StateAttributes,
+        # StatesMeta and old state rows are resolved when the rows are written.
+        self._pending_rows: list[dict[str, Any]] = []
+        self._pending_rows_old_row: list[int | None] = []
+        self._pending_rows_depth: list[int] = []
+        self._pending_rows_attributes: list[StateAttributes | None] = []
+        self._pending_rows_states_meta: list[StatesMeta | None] = []
+        self._pending_row_by_entity_id: dict[str, int] = {}
+        self._written_rows_state_ids: list[int] = []
 
     def pop_pending(self, entity_id: str) -> States | None:
         """Pop a pending state.
@@ -43,6 +58,87 @@ class StatesManager:
         """
         self._pending[entity_id] = state
 
+    def pop_pending_row(self, entity_id: str) -> int | None:
+        """Pop the index of a pending row.
+
+        Pending rows are rows that will be inserted in bulk on the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        return self._pending_row_by_entity_id.pop(entity_id, None)
+
+    def add_pending_row(
+        self,
+        entity_id: str | None,
+        row: dict[str, Any],
+        old_row: int | None,
+        state_attributes: StateAttributes | None,
+        states_meta: StatesMeta | None,
+    ) -> None:
+        """Add a row to insert in bulk on the next commit.
+
+        old_row is the index of the pending row of the previous state, and
+        state_attributes and states_meta are pending objects whose ids are
+        not known until the session is flushed. If entity_id is not None the
+        row becomes the old state of the next row of the entity.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        index = len(self._pending_rows)
+        self._pending_rows.append(row)
+        self._pending_rows_old_row.append(old_row)
+        self._pending_rows_depth.append(
+            0 if old_row is None else self._pending_rows_depth[old_row] + 1
+        )
+        self._pending_rows_attributes.append(state_attributes)
+        self._pending_rows_states_meta.append(states_meta)
+        if entity_id is not None:
+            self._pending_row_by_entity_id[entity_id] = index
+
+    def has_pending_rows(self) -> bool:
+        """Return if there are rows waiting to be inserted.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        return bool(self._pending_rows)
+
+    def write_pending_rows(self, session: Session) -> None:
+        """Insert the pending rows in bulk.
+
+        The session must be flushed first so the pending StateAttributes
+        and StatesMeta have their ids. Rows are inserted with one executemany
+        per chain depth so the old_state_id of a row is always known before
+        it is inserted.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        rows = self._pending_rows
+        old_rows = self._pending_rows_old_row
+        rows_by_depth: list[list[int]] = []
+        for index, row in enumerate(rows):
+            if (state_attributes := self._pending_rows_attributes[index]) is not None:
+                row["attributes_id"] = state_attributes.attributes_id
+            if (states_meta := self._pending_rows_states_meta[index]) is not None:
+                row["metadata_id"] = states_meta.metadata_id
+            depth = self._pending_rows_depth[index]
+            if depth == len(rows_by_depth):
+                rows_by_depth.append([])
+            rows_by_depth[depth].append(index)
+
+        state_ids = self._written_rows_state_ids = [0] * len(rows)
+        stmt = insert(States).returning(States.state_id, sort_by_parameter_order=True)
+        for indexes in rows_by_depth:
+            for index in indexes:
+                if (old_row := old_rows[index]) is not None:
+                    rows[index]["old_state_id"] = state_ids[old_row]
+            result = session.execute(stmt, [rows[index] for index in indexes])
+            for index, state_id in zip(indexes, result.scalars()):
+                state_ids[index] = state_id
+
     def post_commit_pending(self) -> None:
         """Call after commit to load the state_id of the new States into committed.
 
@@ -52,6 +148,20 @@ class StatesManager:
         for entity_id, db_states in self._pending.items():
             self._last_committed_id[entity_id] = db_states.state_id
         self._pending.clear()
+        if state_ids := self._written_rows_state_ids:
+            for entity_id, index in self._pending_row_by_entity_id.items():
+                self._last_committed_id[entity_id] = state_ids[index]
+        self._clear_pending_rows()
+
+    def _clear_pending_rows(self) -> None:
+        """Clear the rows waiting to be inserted."""
+        self._pending_rows.clear()
+        self._pending_rows_old_row.clear()
+        self._pending_rows_depth.clear()
+        self._pending_rows_attributes.clear()
+        self._pending_rows_states_meta.clear()
+        self._pending_row_by_entity_id.clear()
+        self._written_rows_state_ids = []
 
     def reset(self) -> None:
         """Reset after the database has been reset or changed.
@@ -61,6 +171,7 @@ class StatesManager:
         """
         self._last_committed_id.clear()
         self._pending.clear()
+        self._clear_pending_rows()
 
     def evict_purged_state_ids(self, purged_state_ids: set[int]) -> None:
         """Evict purged states from the committed states.
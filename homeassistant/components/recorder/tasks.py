@@ -24,6 +24,7 @@ _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from .core import Recorder
+    from .serializer import SerializedEvent
 
 
 @dataclass(slots=True)
@@ -110,6 +111,11 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
+        if self.apply_filter:
+            instance.recent_states.purge_entities(
+                lambda entity_id: not instance.entity_filter(entity_id)
+            )
+        instance.recent_states.purge(self.purge_before.timestamp(), None)
         if purge.purge_old_data(
             instance, self.purge_before, self.repack, self.apply_filter
         ):
@@ -135,6 +141,7 @@ class PurgeEntitiesTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge entities from the database."""
+        instance.recent_states.purge(self.purge_before.timestamp(), self.entity_filter)
         if purge.purge_entity_data(instance, self.entity_filter, self.purge_before):
             return
         # Schedule a new purge task if this one didn't finish
@@ -273,12 +280,13 @@ class EventTask(RecorderTask):
     """An event to be processed."""
 
     event: Event
+    serialized: SerializedEvent | None = None
     commit_before = False
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
         # pylint: disable-next=[protected-access]
-        instance._process_one_event(self.event)
+        instance._process_one_event(self)
 
 
 @dataclass(slots=True)
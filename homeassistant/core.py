@@ -129,6 +129,9 @@ DOMAIN = "homeassistant"
 # How long to wait to log tasks that are blocking
 BLOCK_LOG_TIMEOUT = 60
 
+# The keys of State.as_dict after the attributes
+_STATE_DICT_TAIL_KEYS = ("last_changed", "last_updated", "context")
+
 ServiceResponse = JsonObjectType | None
 
 
@@ -975,18 +978,22 @@ _FilterableJobType = tuple[
     Callable[[Event], bool] | None,  # event_filter
     bool,  # run_immediately
 ]
+_KeyedJobsType = dict[str, list[HassJob[[Event], Coroutine[Any, Any, None] | None]]]
 
 
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_listeners", "_match_all_listeners", "_hass")
+    __slots__ = ("_listeners", "_match_all_listeners", "_keyed_listeners", "_hass")
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJobType]] = {}
         self._match_all_listeners: list[_FilterableJobType] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
+        self._keyed_listeners: dict[
+            str, dict[Callable[[Event], str], _KeyedJobsType]
+        ] = {}
         self._hass = hass
 
     @callback
@@ -995,7 +1002,23 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        # Each keyed index counts as a single listener
+        for event_type, indexes in self._keyed_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + len(indexes)
+        return listeners
+
+    @callback
+    def async_keyed_listeners(self, event_type: str) -> dict[str, int]:
+        """Return dictionary with keys and the number of keyed listeners.
+
+        This method must be run in the event loop.
+        """
+        keyed_listeners: dict[str, int] = {}
+        for callbacks in self._keyed_listeners.get(event_type, {}).values():
+            for key, jobs in callbacks.items():
+                keyed_listeners[key] = keyed_listeners.get(key, 0) + len(jobs)
+        return keyed_listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -1034,8 +1057,9 @@ class EventBus:
 
         listeners = self._listeners.get(event_type, [])
         match_all_listeners = self._match_all_listeners
+        keyed_listeners = self._keyed_listeners.get(event_type)
 
-        if not listeners and not match_all_listeners:
+        if not listeners and not match_all_listeners and not keyed_listeners:
             return
 
         # EVENT_HOMEASSISTANT_CLOSE should not be sent to MATCH_ALL listeners
@@ -1063,6 +1087,143 @@ class EventBus:
             else:
                 self._hass.async_add_hass_job(job, event)
 
+        if not keyed_listeners:
+            return
+
+        for event_key, callbacks in keyed_listeners.items():
+            try:
+                key = event_key(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in event key function")
+                continue
+            if key in callbacks:
+                self._hass.loop.call_soon(
+                    self._async_dispatch_keyed, callbacks, key, event
+                )
+
+    @callback
+    def _async_dispatch_keyed(
+        self, callbacks: _KeyedJobsType, key: str, event: Event
+    ) -> None:
+        """Dispatch an event to the listeners of a key."""
+        if not (callbacks_list := callbacks.get(key)):
+            return
+        for job in callbacks_list[:]:
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while dispatching event for %s to %s", key, job
+                )
+
+    @callback
+    def async_fire_many(
+        self,
+        event_type: str,
+        event_data_list: Iterable[dict[str, Any] | None],
+        origin: EventOrigin = EventOrigin.local,
+        context: Context | None = None,
+        time_fired: datetime.datetime | None = None,
+    ) -> None:
+        """Fire multiple events of the same type.
+
+        Callback listeners that are not run immediately receive all the
+        events that pass their filter in a single loop iteration instead
+        of being scheduled once per event.
+
+        This method must be run in the event loop.
+        """
+        if len(event_type) > MAX_LENGTH_EVENT_EVENT_TYPE:
+            raise MaxLengthExceeded(
+                event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
+            )
+
+        listeners = self._listeners.get(event_type, [])
+        match_all_listeners = self._match_all_listeners
+        keyed_listeners = self._keyed_listeners.get(event_type)
+
+        if not listeners and not match_all_listeners and not keyed_listeners:
+            return
+
+        # EVENT_HOMEASSISTANT_CLOSE should not be sent to MATCH_ALL listeners
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            listeners = match_all_listeners + listeners
+
+        events = [
+            Event(event_type, event_data, origin, time_fired, context)
+            for event_data in event_data_list
+        ]
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            for event in events:
+                _LOGGER.debug("Bus:Handling %s", event)
+
+        for job, event_filter, run_immediately in listeners:
+            if event_filter is None:
+                matching_events = events
+            else:
+                matching_events = []
+                for event in events:
+                    try:
+                        if event_filter(event):
+                            matching_events.append(event)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error in event filter")
+                if not matching_events:
+                    continue
+            if run_immediately:
+                for event in matching_events:
+                    try:
+                        job.target(event)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error running job: %s", job)
+            elif job.job_type == HassJobType.Callback:
+                self._hass.loop.call_soon(
+                    self._async_run_callback_job_many, job, matching_events
+                )
+            else:
+                for event in matching_events:
+                    self._hass.async_add_hass_job(job, event)
+
+        if not keyed_listeners:
+            return
+
+        for event_key, callbacks in keyed_listeners.items():
+            keyed_events: list[tuple[str, Event]] = []
+            for event in events:
+                try:
+                    key = event_key(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in event key function")
+                    continue
+                if key in callbacks:
+                    keyed_events.append((key, event))
+            if keyed_events:
+                self._hass.loop.call_soon(
+                    self._async_dispatch_keyed_many, callbacks, keyed_events
+                )
+
+    @callback
+    def _async_run_callback_job_many(
+        self,
+        job: HassJob[[Event], Coroutine[Any, Any, None] | None],
+        events: list[Event],
+    ) -> None:
+        """Run a callback job for each event."""
+        for event in events:
+            try:
+                job.target(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running job: %s", job)
+
+    @callback
+    def _async_dispatch_keyed_many(
+        self, callbacks: _KeyedJobsType, keyed_events: list[tuple[str, Event]]
+    ) -> None:
+        """Dispatch events to the listeners of their keys."""
+        for key, event in keyed_events:
+            self._async_dispatch_keyed(callbacks, key, event)
+
     def listen(
         self,
         event_type: str,
@@ -1115,6 +1276,52 @@ class EventBus:
             (HassJob(listener, f"listen {event_type}"), event_filter, run_immediately),
         )
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        event_key: Callable[[Event], str],
+        keys: str | Iterable[str],
+        listener: Callable[[Event], Coroutine[Any, Any, None] | None],
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type whose key is one of keys.
+
+        event_key maps an event to its key (e.g. the entity_id of a
+        state_changed event). It is only used to look up listeners and is
+        never scheduled as a job, so it does not need to be a callback.
+
+        Listeners sharing the same event_key are stored in a single index
+        so firing an event only looks up the listeners for its key instead
+        of running a filter for every listener. event_key must be a stable
+        object such as a module level function so that all listeners keyed
+        by it end up in the same index.
+
+        This method must be run in the event loop.
+        """
+        if isinstance(keys, str):
+            keys = [keys]
+        else:
+            keys = list(keys)
+
+        indexes = self._keyed_listeners.setdefault(event_type, {})
+        if (callbacks := indexes.get(event_key)) is None:
+            callbacks = indexes[event_key] = {}
+
+        job: HassJob[[Event], Coroutine[Any, Any, None] | None] = HassJob(
+            listener, f"track {event_type} event {keys}"
+        )
+        for key in keys:
+            if callback_list := callbacks.get(key):
+                callback_list.append(job)
+            else:
+                callbacks[key] = [job]
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_keyed_listener(event_type, event_key, keys, job)
+
+        return remove_listener
+
     @callback
     def _async_listen_filterable_job(
         self, event_type: str, filterable_job: _FilterableJobType
@@ -1215,6 +1422,43 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: str,
+        event_key: Callable[[Event], str],
+        keys: Iterable[str],
+        job: HassJob[[Event], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Remove a keyed listener.
+
+        Empty indexes are removed so firing an event type without keyed
+        listeners keeps taking the fast path.
+
+        This method must be run in the event loop.
+        """
+        try:
+            indexes = self._keyed_listeners[event_type]
+            callbacks = indexes[event_key]
+        except KeyError:
+            _LOGGER.exception("Unable to remove unknown job listener %s", job)
+            return
+
+        for key in keys:
+            try:
+                callbacks[key].remove(job)
+            except (KeyError, ValueError):
+                _LOGGER.exception("Unable to remove unknown job listener %s", job)
+                continue
+            # delete key list if empty
+            if not callbacks[key]:
+                del callbacks[key]
+
+        if not callbacks:
+            del indexes[event_key]
+            if not indexes:
+                del self._keyed_listeners[event_type]
+
 
 class State:
     """Object to represent a state within the state machine.
@@ -1241,6 +1485,7 @@ class State:
         "_as_dict",
         "_as_dict_json",
         "_as_compressed_state_json",
+        "_attributes_json",
     )
 
     def __init__(
@@ -1270,7 +1515,12 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = ReadOnlyDict(attributes or {})
+        # Attributes which are already read only are shared instead of copied
+        self.attributes = (
+            attributes
+            if type(attributes) is ReadOnlyDict  # pylint: disable=unidiomatic-typecheck
+            else ReadOnlyDict(attributes or {})
+        )
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
@@ -1278,6 +1528,7 @@ class State:
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
         self._as_dict_json: str | None = None
         self._as_compressed_state_json: str | None = None
+        self._attributes_json: str | None = None
 
     @property
     def name(self) -> str:
@@ -1315,9 +1566,36 @@ class State:
     def as_dict_json(self) -> str:
         """Return a JSON string of the State."""
         if not self._as_dict_json:
-            self._as_dict_json = json_dumps(self.as_dict())
+            as_dict = self.as_dict()
+            head_json = json_dumps({"entity_id": self.entity_id, "state": self.state})[
+                1:-1
+            ]
+            tail_json = json_dumps(
+                {key: as_dict[key] for key in _STATE_DICT_TAIL_KEYS}
+            )[1:-1]
+            self._as_dict_json = (
+                f'{{{head_json},"attributes":{self.attributes_json()},{tail_json}}}'
+            )
         return self._as_dict_json
 
+    def attributes_json(self) -> str:
+        """Return a JSON string of the attributes.
+
+        The string is shared with the next state of the entity
+        when the attributes are unchanged.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = json_dumps(self.attributes)
+        return self._attributes_json
+
+    def share_attributes_json(self, old_state: State) -> None:
+        """Share the attributes JSON of the previous state of the entity.
+
+        Must only be called when the state was created with the
+        attributes of the previous state.
+        """
+        self._attributes_json = old_state._attributes_json
+
     def as_compressed_state(self) -> dict[str, Any]:
         """Build a compressed dict of a state for adds.
 
@@ -1350,9 +1628,16 @@ class State:
         It is used for sending multiple states in a single message.
         """
         if not self._as_compressed_state_json:
-            self._as_compressed_state_json = json_dumps(
-                {self.entity_id: self.as_compressed_state()}
+            compressed_state = self.as_compressed_state()
+            del compressed_state[COMPRESSED_STATE_ATTRIBUTES]
+            state_json = json_dumps(
+                {COMPRESSED_STATE_STATE: compressed_state.pop(COMPRESSED_STATE_STATE)}
             )[1:-1]
+            self._as_compressed_state_json = (
+                f"{json_dumps(self.entity_id)}:{{{state_json}"
+                f',"{COMPRESSED_STATE_ATTRIBUTES}":{self.attributes_json()}'
+                f",{json_dumps(compressed_state)[1:-1]}}}"
+            )
         return self._as_compressed_state_json
 
     @classmethod
@@ -1419,11 +1704,13 @@ class State:
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_reservations", "_bus", "_loop")
+    __slots__ = ("_states", "_states_by_domain", "_reservations", "_bus", "_loop")
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        # Secondary index of the states by domain for domain filtered queries
+        self._states_by_domain: dict[str, dict[str, State]] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1446,14 +1733,15 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states)
 
+        states_by_domain = self._states_by_domain
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(states_by_domain.get(domain_filter.lower(), ()))
 
-        return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
-        ]
+        entity_ids: list[str] = []
+        for domain in domain_filter:
+            if domain_states := states_by_domain.get(domain):
+                entity_ids.extend(domain_states)
+        return entity_ids
 
     @callback
     def async_entity_ids_count(
@@ -1466,11 +1754,14 @@ class StateMachine:
         if domain_filter is None:
             return len(self._states)
 
+        states_by_domain = self._states_by_domain
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(states_by_domain.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
+        return sum(
+            len(domain_states)
+            for domain in domain_filter
+            if (domain_states := states_by_domain.get(domain))
         )
 
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
@@ -1490,12 +1781,17 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states.values())
 
+        states_by_domain = self._states_by_domain
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            if domain_states := states_by_domain.get(domain_filter.lower()):
+                return list(domain_states.values())
+            return []
 
-        return [
-            state for state in self._states.values() if state.domain in domain_filter
-        ]
+        states: list[State] = []
+        for domain in domain_filter:
+            if domain_states := states_by_domain.get(domain):
+                states.extend(domain_states.values())
+        return states
 
     def get(self, entity_id: str) -> State | None:
         """Retrieve state of entity_id or None if not found.
@@ -1538,6 +1834,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._states_by_domain[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._states_by_domain[old_state.domain]
+
         old_state.expire()
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
@@ -1629,6 +1930,11 @@ class StateMachine:
         if same_state and same_attr:
             return
 
+        if same_attr and old_state is not None:
+            # The previous state has the same attributes, share them
+            # instead of making another read only copy
+            attributes = old_state.attributes
+
         if context is None:
             # It is much faster to convert a timestamp to a utc datetime object
             # than converting a utc datetime object to a timestamp since cpython
@@ -1657,8 +1963,11 @@ class StateMachine:
             old_state is None,
         )
         if old_state is not None:
+            if same_attr:
+                state.share_attributes_json(old_state)
             old_state.expire()
         self._states[entity_id] = state
+        self._async_index_state(state)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -1667,6 +1976,100 @@ class StateMachine:
             time_fired=now,
         )
 
+    @callback
+    def _async_index_state(self, state: State) -> None:
+        """Store a state in the domain index."""
+        if (domain_states := self._states_by_domain.get(state.domain)) is None:
+            domain_states = self._states_by_domain[state.domain] = {}
+        domain_states[state.entity_id] = state
+
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+    ) -> None:
+        """Set the state of multiple entities, add entities if they do not exist.
+
+        states is an iterable of (entity_id, new_state, attributes) tuples.
+
+        All changed states share the same timestamp and context, entities
+        whose state and attributes are unchanged are skipped. The
+        state_changed events are fired together with EventBus.async_fire_many.
+
+        This method must be run in the event loop.
+        """
+        pending: dict[str, State] = {}
+        changes: list[tuple[str, State | None, State]] = []
+        now: datetime.datetime | None = None
+
+        for entity_id, new_state, attributes in states:
+            entity_id = entity_id.lower()
+            new_state = str(new_state)
+            attributes = attributes or {}
+            if (old_state := pending.get(entity_id)) is None:
+                old_state = self._states.get(entity_id)
+            if old_state is None:
+                same_state = False
+                same_attr = False
+                last_changed = None
+            else:
+                same_state = old_state.state == new_state and not force_update
+                same_attr = old_state.attributes == attributes
+                last_changed = old_state.last_changed if same_state else None
+
+            if same_state and same_attr:
+                continue
+
+            if same_attr and old_state is not None:
+                # See async_set for why the attributes are shared
+                attributes = old_state.attributes
+
+            if now is None:
+                # See async_set for why the timestamp is converted this way
+                if context is None:
+                    timestamp = time.time()
+                    now = dt_util.utc_from_timestamp(timestamp)
+                    context = Context(id=ulid_at_time(timestamp))
+                else:
+                    now = dt_util.utcnow()
+
+            state = State(
+                entity_id,
+                new_state,
+                attributes,
+                last_changed,
+                now,
+                context,
+                old_state is None,
+            )
+            if same_attr and old_state is not None:
+                state.share_attributes_json(old_state)
+            pending[entity_id] = state
+            changes.append((entity_id, old_state, state))
+
+        if not changes:
+            return
+
+        event_data_list: list[dict[str, Any] | None] = []
+        for entity_id, old_state, state in changes:
+            if old_state is not None:
+                old_state.expire()
+            self._states[entity_id] = state
+            self._async_index_state(state)
+            event_data_list.append(
+                {"entity_id": entity_id, "old_state": old_state, "new_state": state}
+            )
+
+        self._bus.async_fire_many(
+            EVENT_STATE_CHANGED,
+            event_data_list,
+            EventOrigin.local,
+            context,
+            time_fired=now,
+        )
+
 
 class SupportsResponse(enum.StrEnum):
     """Service call response configuration."""
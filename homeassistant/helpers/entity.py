@@ -61,6 +61,18 @@ SOURCE_PLATFORM_CONFIG = "platform_config"
 
 # Used when converting float states to string: limit precision according to machine
 # epsilon to make the string representation readable
+# The properties and methods used to calculate the friendly name, the friendly
+# name of entities which do not override any of them can be cached
+_FRIENDLY_NAME_MEMBERS = (
+    "_friendly_name_internal",
+    "_name_internal",
+    "has_entity_name",
+    "name",
+    "use_device_name",
+)
+# Entity classes and if the friendly name of their entities can be cached
+_CACHEABLE_FRIENDLY_NAME: dict[type, bool] = {}
+
 FLOAT_PRECISION = abs(int(math.floor(math.log10(abs(sys.float_info.epsilon))))) - 1
 
 
@@ -174,6 +186,38 @@ def get_unit_of_measurement(hass: HomeAssistant, entity_id: str) -> str | None:
     return entry.unit_of_measurement
 
 
+@callback
+def async_write_ha_states(hass: HomeAssistant, entities: Iterable[Entity]) -> None:
+    """Write the state of multiple entities to the state machine.
+
+    Entities sharing the same force_update are written with a single call to
+    async_set_many so the state changes share one timestamp and context and
+    are fired together. Entities with a context of their own are written
+    individually to keep their context.
+    """
+    # pylint: disable=protected-access
+    batches: dict[bool, list[tuple[str, str, Mapping[str, Any]]]] = {}
+    for entity in entities:
+        if entity.entity_id is None:
+            raise NoEntitySpecifiedError(
+                f"No entity id specified for entity {entity.name}"
+            )
+        if (calculated := entity._async_calculate_state()) is None:
+            continue
+        state, attr = calculated
+        if entity._context is not None:
+            hass.states.async_set(
+                entity.entity_id, state, attr, entity.force_update, entity._context
+            )
+            continue
+        batches.setdefault(entity.force_update, []).append(
+            (entity.entity_id, state, attr)
+        )
+
+    for force_update, states in batches.items():
+        hass.states.async_set_many(states, force_update)
+
+
 class DeviceInfo(TypedDict, total=False):
     """Entity device information for device registry."""
 
@@ -280,6 +324,9 @@ class Entity(ABC):
     # The device entry for this entity
     device_entry: dr.DeviceEntry | None = None
 
+    # The friendly name and the values it was calculated from
+    _friendly_name_cache: tuple[tuple[Any, ...], str | None] | None = None
+
     # Hold list for functions to call on remove.
     _on_remove: list[CALLBACK_TYPE] | None = None
 
@@ -774,12 +821,57 @@ class Entity(ABC):
             return device_name
         return f"{device_name} {name}" if device_name else name
 
+    def _cached_friendly_name_internal(self) -> str | None:
+        """Return the friendly name, calculated again only when it may change.
+
+        The friendly name is cached for entities using the naming of Entity, it
+        only depends on the device entry, the entity description, the instance
+        name attributes and the static translations. Entities overriding the
+        naming are not cached since their name can depend on anything.
+        """
+        entity_type = type(self)
+        if (cacheable := _CACHEABLE_FRIENDLY_NAME.get(entity_type)) is None:
+            cacheable = _CACHEABLE_FRIENDLY_NAME[entity_type] = all(
+                getattr(entity_type, member) is getattr(Entity, member)
+                for member in _FRIENDLY_NAME_MEMBERS
+            )
+        if not cacheable:
+            return self._friendly_name_internal()
+
+        instance_attrs = self.__dict__
+        key = (
+            self.device_entry,
+            getattr(self, "entity_description", None),
+            instance_attrs.get("_attr_name", UNDEFINED),
+            instance_attrs.get("_attr_has_entity_name", UNDEFINED),
+            self._default_to_device_class_name(),
+        )
+        if (cache := self._friendly_name_cache) is not None and cache[0] == key:
+            return cache[1]
+        name = self._friendly_name_internal()
+        self._friendly_name_cache = (key, name)
+        return name
+
     @callback
     def _async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
+        if (calculated := self._async_calculate_state()) is None:
+            return
+
+        state, attr = calculated
+        self.hass.states.async_set(
+            self.entity_id, state, attr, self.force_update, self._context
+        )
+
+    @callback
+    def _async_calculate_state(self) -> tuple[str, dict[str, Any]] | None:
+        """Calculate the state and attributes to write to the state machine.
+
+        Returns None if the state should not be written.
+        """
         if self._platform_state == EntityPlatformState.REMOVED:
             # Polling returned after the entity has already been removed
-            return
+            return None
 
         hass = self.hass
         entity_id = self.entity_id
@@ -796,7 +888,7 @@ class Entity(ABC):
                     entity_id,
                     self.platform.platform_name,
                 )
-            return
+            return None
 
         start = timer()
 
@@ -830,7 +922,7 @@ class Entity(ABC):
             attr[ATTR_ICON] = icon
 
         if (
-            name := (entry and entry.name) or self._friendly_name_internal()
+            name := (entry and entry.name) or self._cached_friendly_name_internal()
         ) is not None:
             attr[ATTR_FRIENDLY_NAME] = name
 
@@ -861,7 +953,7 @@ class Entity(ABC):
             self._context = None
             self._context_set = None
 
-        hass.states.async_set(entity_id, state, attr, self.force_update, self._context)
+        return state, attr
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
@@ -137,6 +137,11 @@ class EntityPlatform:
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: CALLBACK_TYPE | None = None
         self._process_updates: asyncio.Lock | None = None
+        # Number of polling intervals skipped because the previous
+        # update of the entities was still in progress
+        self.polling_overruns = 0
+        # Duration in seconds of the last update of the polling entities
+        self.last_polling_duration: float | None = None
 
         self.parallel_updates: asyncio.Semaphore | None = None
         self._update_in_sequence: bool = False
@@ -852,32 +857,45 @@ class EntityPlatform:
         if self._process_updates is None:
             self._process_updates = asyncio.Lock()
         if self._process_updates.locked():
+            self.polling_overruns += 1
             self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
+                (
+                    "Updating %s %s took longer than the scheduled update interval"
+                    " %s, %s updates were skipped"
+                ),
                 self.platform_name,
                 self.domain,
                 self.scan_interval,
+                self.polling_overruns,
             )
             return
 
         async with self._process_updates:
-            if self._update_in_sequence or len(self.entities) <= 1:
-                # If we know we will update sequentially, we want to avoid scheduling
-                # the coroutines as tasks that will wait on the semaphore lock.
-                for entity in list(self.entities.values()):
-                    # If the entity is removed from hass during the previous
-                    # entity being updated, we need to skip updating the
-                    # entity.
-                    if entity.should_poll and entity.hass:
-                        await entity.async_update_ha_state(True)
-                return
+            start = self.hass.loop.time()
+            try:
+                await self._async_update_polling_entities()
+            finally:
+                self.last_polling_duration = self.hass.loop.time() - start
+
+    async def _async_update_polling_entities(self) -> None:
+        """Update the states of the polling entities."""
+        if self._update_in_sequence or len(self.entities) <= 1:
+            # If we know we will update sequentially, we want to avoid scheduling
+            # the coroutines as tasks that will wait on the semaphore lock.
+            for entity in list(self.entities.values()):
+                # If the entity is removed from hass during the previous
+                # entity being updated, we need to skip updating the
+                # entity.
+                if entity.should_poll and entity.hass:
+                    await entity.async_update_ha_state(True)
+            return
 
-            if tasks := [
-                entity.async_update_ha_state(True)
-                for entity in self.entities.values()
-                if entity.should_poll
-            ]:
-                await asyncio.gather(*tasks)
+        if tasks := [
+            entity.async_update_ha_state(True)
+            for entity in self.entities.values()
+            if entity.should_poll
+        ]:
+            await asyncio.gather(*tasks)
 
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
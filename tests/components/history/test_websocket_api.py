@@ -403,6 +403,52 @@ async def test_history_during_period_significant_domain(
     assert "lc" not in sensor_test_history[0]  # skipped if the same a last_updated (lu)
 
 
+@pytest.mark.parametrize("no_attributes", [True, False])
+async def test_history_during_period_chunked(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    no_attributes: bool,
+) -> None:
+    """Test history_during_period sends the states of each entity in chunks."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    hass.states.async_set("sensor.two", "on", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "off", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    query = {
+        "type": "history/history_during_period",
+        "start_time": now.isoformat(),
+        "entity_ids": ["sensor.one", "sensor.two", "sensor.missing"],
+        "no_attributes": no_attributes,
+    }
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, **query})
+    response = await client.receive_json()
+    assert response["success"]
+    expected = response["result"]
+    assert len(expected["sensor.one"]) == 2
+
+    await client.send_json({"id": 2, **query, "chunked": True})
+    chunked: dict[str, list] = {}
+    for _ in range(2):
+        response = await client.receive_json()
+        assert response["id"] == 2
+        assert response["type"] == "event"
+        assert len(response["event"]["states"]) == 1
+        chunked.update(response["event"]["states"])
+    response = await client.receive_json()
+    assert response["id"] == 2
+    assert response["success"]
+    assert response["result"] == {}
+    assert chunked == expected
+
+
 async def test_history_during_period_bad_start_time(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -8,6 +8,7 @@ import ssl
 from typing import Any, TypedDict
 from unittest.mock import ANY, MagicMock, call, mock_open, patch
 
+from paho.mqtt.client import MQTTMessage
 import pytest
 import voluptuous as vol
 
@@ -21,6 +22,7 @@ from homeassistant.const import (
     ATTR_ASSUMED_STATE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     SERVICE_RELOAD,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
@@ -41,6 +43,7 @@ from .test_common import help_all_subscribe_calls
 
 from tests.common import (
     MockConfigEntry,
+    async_capture_events,
     async_fire_mqtt_message,
     async_fire_time_changed,
     mock_restore_cache,
@@ -1209,6 +1212,135 @@ async def test_subscribe_topic_sys_root(
     assert calls[0].payload == "test-payload"
 
 
+async def test_handle_received_messages_in_batches(
+    hass: HomeAssistant,
+    mqtt_client_mock: MqttMockPahoClient,
+    mqtt_mock_entry: MqttMockHAClientGenerator,
+    calls: list[ReceiveMessage],
+    record_calls: MessageCallbackType,
+) -> None:
+    """Test the messages received by paho wake up the event loop once per batch."""
+    await mqtt_mock_entry()
+    await mqtt.async_subscribe(hass, "test-topic/+", record_calls)
+
+    def _receive_messages() -> None:
+        for idx in range(3):
+            msg = MQTTMessage(topic=f"test-topic/{idx}".encode())
+            msg.payload = b"test-payload"
+            mqtt_client_mock.on_message(None, None, msg)
+
+    with patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as mock_call_soon_threadsafe:
+        await hass.async_add_executor_job(_receive_messages)
+        await hass.async_block_till_done()
+
+    handler_calls = [
+        mock_call
+        for mock_call in mock_call_soon_threadsafe.mock_calls
+        if mock_call.args[0].__name__ == "_async_handle_pending_messages"
+    ]
+    assert len(handler_calls) == 1
+    assert [msg.topic for msg in calls] == [
+        "test-topic/0",
+        "test-topic/1",
+        "test-topic/2",
+    ]
+    assert calls[0].timestamp == calls[1].timestamp == calls[2].timestamp
+
+
+@pytest.mark.parametrize(
+    "hass_config",
+    [
+        {
+            mqtt.DOMAIN: {
+                "sensor": [
+                    {
+                        "name": "test-sensor",
+                        "state_topic": "test/state",
+                        "json_attributes_topic": "test/attributes",
+                    }
+                ]
+            }
+        }
+    ],
+)
+async def test_write_entity_state_once_per_batch(
+    hass: HomeAssistant,
+    mock_hass_config: None,
+    mqtt_client_mock: MqttMockPahoClient,
+    mqtt_mock_entry: MqttMockHAClientGenerator,
+) -> None:
+    """Test an entity updated by several messages of a batch writes its state once."""
+    await mqtt_mock_entry()
+    await hass.async_block_till_done()
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    def _receive_messages() -> None:
+        for topic, payload in (
+            ("test/state", b"1"),
+            ("test/attributes", b'{"val": "a"}'),
+            ("test/state", b"2"),
+        ):
+            msg = MQTTMessage(topic=topic.encode())
+            msg.payload = payload
+            mqtt_client_mock.on_message(None, None, msg)
+
+    await hass.async_add_executor_job(_receive_messages)
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    state = hass.states.get("sensor.test_sensor")
+    assert state is not None
+    assert state.state == "2"
+    assert state.attributes["val"] == "a"
+
+
+async def test_subscribe_overlapping_wildcard_topics(
+    hass: HomeAssistant,
+    mqtt_mock_entry: MqttMockHAClientGenerator,
+) -> None:
+    """Test the matching subscriptions are updated when subscribing and unsubscribing."""
+    await mqtt_mock_entry()
+    received: list[tuple[str, str]] = []
+
+    def _record(name: str) -> MessageCallbackType:
+        @callback
+        def _record_message(msg: ReceiveMessage) -> None:
+            received.append((name, msg.topic))
+
+        return _record_message
+
+    await mqtt.async_subscribe(hass, "home/+/state", _record("single"))
+    async_fire_mqtt_message(hass, "home/kitchen/state", "on")
+    await hass.async_block_till_done()
+    assert received == [("single", "home/kitchen/state")]
+
+    received.clear()
+    unsub_multi = await mqtt.async_subscribe(hass, "home/#", _record("multi"))
+    await mqtt.async_subscribe(hass, "home/kitchen/state", _record("simple"))
+    async_fire_mqtt_message(hass, "home/kitchen/state", "on")
+    async_fire_mqtt_message(hass, "home", "on")
+    async_fire_mqtt_message(hass, "$home/kitchen/state", "on")
+    await hass.async_block_till_done()
+    assert sorted(received) == [
+        ("multi", "home"),
+        ("multi", "home/kitchen/state"),
+        ("simple", "home/kitchen/state"),
+        ("single", "home/kitchen/state"),
+    ]
+
+    received.clear()
+    unsub_multi()
+    async_fire_mqtt_message(hass, "home/kitchen/state", "on")
+    async_fire_mqtt_message(hass, "home", "on")
+    await hass.async_block_till_done()
+    assert sorted(received) == [
+        ("simple", "home/kitchen/state"),
+        ("single", "home/kitchen/state"),
+    ]
+
+
 async def test_subscribe_topic_sys_root_and_wildcard_topic(
     hass: HomeAssistant,
     mqtt_mock_entry: MqttMockHAClientGenerator,
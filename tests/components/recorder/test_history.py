@@ -29,6 +29,7 @@ from homeassistant.components.recorder.models.legacy import (
     LegacyLazyState,
     LegacyLazyStatePreSchema31,
 )
+from homeassistant.components.recorder.services import SERVICE_PURGE_ENTITIES
 from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.core import HomeAssistant, State
@@ -1200,3 +1201,196 @@ def test_get_last_state_changes_with_non_existent_entity_ids_returns_empty(
     """Test get_last_state_changes returns an empty dict when entities not in the db."""
     hass = hass_recorder()
     assert history.get_last_state_changes(hass, 1, "nonexistent.entity") == {}
+
+
+def _record_recent_states(hass: HomeAssistant) -> datetime:
+    """Record states after the start of the recorder run."""
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    changes = [
+        (0, "sensor.temp", "20", {"unit": "C"}),
+        (0, "climate.living", "heat", {"temperature": 20}),
+        (0, "light.kitchen", "on", {}),
+        (10, "sensor.temp", "21", {"unit": "C"}),
+        (10, "climate.living", "heat", {"temperature": 21}),
+        (20, "sensor.temp", "21", {"unit": "F"}),
+        (20, "light.kitchen", "off", {}),
+        (30, "climate.living", "off", {"temperature": 21}),
+        (30, "sensor.temp", "22", {"unit": "F"}),
+        (40, "light.kitchen", None, {}),
+        (50, "sensor.temp", "22", {"unit": "C"}),
+    ]
+    for seconds, entity_id, state, attributes in changes:
+        with freeze_time(start + timedelta(seconds=seconds)):
+            if state is None:
+                hass.states.remove(entity_id)
+            else:
+                hass.states.set(entity_id, state, attributes)
+    wait_recording_done(hass)
+    return start
+
+
+@pytest.mark.parametrize("include_start_time_state", [True, False])
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("minimal_response", [True, False])
+def test_get_recent_significant_states_matches_database(
+    hass_recorder: Callable[..., HomeAssistant],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+) -> None:
+    """Test the recent states in memory are the same as the states in the database."""
+    hass = hass_recorder()
+    start = _record_recent_states(hass)
+    entity_ids = ["sensor.temp", "climate.living", "light.kitchen", "sensor.missing"]
+
+    for start_seconds, end_seconds, query_entity_ids in (
+        (-1, None, entity_ids),
+        (5, None, entity_ids),
+        (15, 35, entity_ids),
+        (20, 50, entity_ids),
+        (45, None, entity_ids),
+        (15, None, ["sensor.temp"]),
+        (25, 45, ["light.kitchen"]),
+    ):
+        start_time = start + timedelta(seconds=start_seconds)
+        end_time = end_seconds and start + timedelta(seconds=end_seconds)
+        recent = history.get_recent_significant_states(
+            hass,
+            start_time,
+            end_time,
+            query_entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+        )
+        assert recent is not None
+        assert recent == history.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            query_entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes=True,
+            compressed_state_format=True,
+        )
+
+
+def test_get_recent_significant_states_not_cached(
+    hass_recorder: Callable[..., HomeAssistant]
+) -> None:
+    """Test the database is used when the states are not all in memory."""
+    hass = hass_recorder()
+    start = _record_recent_states(hass)
+    run_start = get_instance(hass).recorder_runs_manager.recording_start
+
+    # Before the run started
+    assert (
+        history.get_recent_significant_states(
+            hass, run_start - timedelta(seconds=1), None, ["sensor.temp"]
+        )
+        is None
+    )
+    # The start time state of a single entity may be older than the run
+    assert (
+        history.get_recent_significant_states(
+            hass, start - timedelta(seconds=1), None, ["sensor.temp"]
+        )
+        is None
+    )
+    assert (
+        history.get_recent_significant_states(
+            hass, start - timedelta(seconds=1), None, ["sensor.temp"], False
+        )
+        is not None
+    )
+
+    with patch(
+        "homeassistant.components.recorder.history.recent.MAX_STATES_PER_ENTITY", 4
+    ), patch("homeassistant.components.recorder.history.recent.EVICT_STATES", 2):
+        for seconds in range(60, 64):
+            with freeze_time(start + timedelta(seconds=seconds)):
+                hass.states.set("sensor.temp", str(seconds))
+        wait_recording_done(hass)
+
+    # The oldest states were dropped from memory
+    start_time = start + timedelta(seconds=35)
+    assert (
+        history.get_recent_significant_states(
+            hass, start_time, None, ["sensor.temp"], False
+        )
+        is None
+    )
+    start_time = start + timedelta(seconds=60.5)
+    assert history.get_recent_significant_states(
+        hass, start_time, None, ["sensor.temp"], False
+    ) == history.get_significant_states(
+        hass,
+        start_time,
+        None,
+        ["sensor.temp"],
+        include_start_time_state=False,
+        no_attributes=True,
+        compressed_state_format=True,
+    )
+
+
+def test_get_recent_significant_states_after_purge(
+    hass_recorder: Callable[..., HomeAssistant]
+) -> None:
+    """Test purged states are dropped from memory."""
+    hass = hass_recorder()
+    start = _record_recent_states(hass)
+    entity_ids = ["sensor.temp", "climate.living", "light.kitchen"]
+
+    with freeze_time(start + timedelta(minutes=5)):
+        hass.services.call(
+            recorder.DOMAIN,
+            SERVICE_PURGE_ENTITIES,
+            {"entity_id": "sensor.temp", "keep_days": 0},
+            blocking=True,
+        )
+    wait_recording_done(hass)
+
+    start_time = start + timedelta(seconds=5)
+    recent = history.get_recent_significant_states(hass, start_time, None, entity_ids)
+    assert recent is not None
+    assert "sensor.temp" not in recent
+    assert recent == history.get_significant_states(
+        hass,
+        start_time,
+        None,
+        entity_ids,
+        no_attributes=True,
+        compressed_state_format=True,
+    )
+
+
+def test_stream_significant_states(hass_recorder: Callable[..., HomeAssistant]) -> None:
+    """Test streaming the states of each entity matches get_significant_states."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    start_time = zero - timedelta(days=2)
+    entity_ids = list(states)
+
+    for minimal_response in (True, False):
+        expected = history.get_significant_states(
+            hass,
+            start_time,
+            four,
+            entity_ids,
+            minimal_response=minimal_response,
+            compressed_state_format=True,
+        )
+        streamed = history.stream_significant_states(
+            hass,
+            start_time,
+            four,
+            entity_ids,
+            minimal_response=minimal_response,
+            compressed_state_format=True,
+        )
+        assert not isinstance(streamed, dict)
+        assert dict(streamed) == expected
@@ -379,11 +379,11 @@ def test_saving_state_with_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+        instance = get_instance(hass)
+        if instance.states_manager.has_pending_rows() or any(
+            isinstance(obj, States) for obj in instance.event_session
+        ):
+            raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with patch("time.sleep"), patch.object(
         get_instance(hass).event_session,
@@ -1393,6 +1393,79 @@ def test_saving_sets_old_state(hass_recorder: Callable[..., HomeAssistant]) -> N
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+def test_saving_sets_old_state_in_one_commit(
+    hass_recorder: Callable[..., HomeAssistant]
+) -> None:
+    """Test saving sets old state for states written in bulk in one commit."""
+    hass = hass_recorder({CONF_COMMIT_INTERVAL: 30})
+    instance = recorder.get_instance(hass)
+    assert instance._bulk_write_states is True
+
+    hass.states.set("test.one", "s1", {"same": "attrs"})
+    hass.states.set("test.two", "s2", {"same": "attrs"})
+    hass.states.set("test.one", "s3", {"same": "attrs"})
+    hass.states.set("test.one", "s4", {"other": "attrs"})
+    hass.states.remove("test.two")
+    hass.block_till_done()
+    # Make sure the states are processed so the commit is not skipped
+    instance.block_till_done()
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                States.attributes_id,
+            ).outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        )
+        assert len(states) == 5
+        states_by_state = {state.state: state for state in states}
+
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s3"].old_state_id == states_by_state["s1"].state_id
+        assert states_by_state["s4"].old_state_id == states_by_state["s3"].state_id
+        assert states_by_state[None].old_state_id == states_by_state["s2"].state_id
+        assert states_by_state[None].entity_id == "test.two"
+        assert (
+            states_by_state["s1"].attributes_id == states_by_state["s2"].attributes_id
+        )
+        assert (
+            states_by_state["s4"].attributes_id != states_by_state["s1"].attributes_id
+        )
+
+    hass.states.set("test.one", "s5", {})
+    # Make sure the states are processed so the commit is not skipped
+    instance.block_till_done()
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        new_state = session.query(States).filter(States.state == "s5").one()
+        assert new_state.old_state_id == states_by_state["s4"].state_id
+
+
+def test_saving_sets_old_state_without_bulk_writes(
+    hass_recorder: Callable[..., HomeAssistant]
+) -> None:
+    """Test saving sets old state when the dialect cannot write states in bulk."""
+    hass = hass_recorder({CONF_COMMIT_INTERVAL: 30})
+    instance = recorder.get_instance(hass)
+    instance._bulk_write_states = False
+
+    hass.states.set("test.one", "s1", {})
+    hass.states.set("test.one", "s2", {})
+    # Make sure the states are processed so the commit is not skipped
+    instance.block_till_done()
+    wait_recording_done(hass)
+
+    assert not instance.states_manager.has_pending_rows()
+    with session_scope(hass=hass, read_only=True) as session:
+        states_by_state = {state.state: state for state in session.query(States)}
+        assert states_by_state["s2"].old_state_id == states_by_state["s1"].state_id
+
+
 def test_saving_state_with_serializable_data(
     hass_recorder: Callable[..., HomeAssistant], caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -1423,6 +1496,57 @@ def test_saving_state_with_serializable_data(
     assert "State is not JSON serializable" in caplog.text
 
 
+async def test_events_serialized_ahead_of_recorder_thread(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test events are serialized while the recorder thread is busy."""
+    instance = recorder_mock
+    await async_wait_recording_done(hass)
+    serialize_from_event = instance.state_attributes_manager.serialize_from_event
+    serialized_in: dict[str, str] = {}
+
+    def _serialize_from_event(event: Event) -> bytes | None:
+        serialized_in[event.data["entity_id"]] = threading.current_thread().name
+        return serialize_from_event(event)
+
+    class BlockQueue(recorder.tasks.RecorderTask):
+        event: threading.Event = threading.Event()
+
+        def run(self, instance: Recorder) -> None:
+            self.event.wait()
+
+    block_task = BlockQueue()
+
+    with patch.object(
+        instance.state_attributes_manager,
+        "serialize_from_event",
+        _serialize_from_event,
+    ):
+        instance.queue_task(block_task)
+        for idx in range(5):
+            hass.states.async_set(f"test.entity_{idx}", "on", {"idx": idx})
+        for _ in range(100):
+            if len(serialized_in) == 5:
+                break
+            await asyncio.sleep(0.01)
+
+        assert instance.backlog_by_stage["serialize"] == 0
+        assert instance.backlog_by_stage["commit"] == instance.backlog >= 5
+        block_task.event.set()
+        await async_wait_recording_done(hass)
+
+    assert set(serialized_in.values()) == {"Recorder serializer"}
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(States.state, StateAttributes.shared_attrs).join(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+        )
+    assert sorted(json_loads(state.shared_attrs)["idx"] for state in states) == list(
+        range(5)
+    )
+
+
 def test_has_services(hass_recorder: Callable[..., HomeAssistant]) -> None:
     """Test the services exist."""
     hass = hass_recorder()
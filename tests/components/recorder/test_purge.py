@@ -16,6 +16,7 @@ from homeassistant.components.recorder.const import (
     SupportedDialect,
 )
 from homeassistant.components.recorder.db_schema import (
+    EventData,
     Events,
     EventTypes,
     RecorderRuns,
@@ -1654,6 +1655,142 @@ async def test_purge_many_old_events(
             assert events.count() == 0
 
 
+@pytest.mark.timeout(30)
+async def test_purge_old_states_by_timestamp_range(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test deleting old states by timestamp range in batches."""
+    max_bind_vars = 5
+    with patch.object(queries, "SQLITE_MAX_BIND_VARS", max_bind_vars), patch.object(
+        purge, "SQLITE_MAX_BIND_VARS", max_bind_vars
+    ):
+        instance = await async_setup_recorder_instance(hass)
+        await async_wait_recording_done(hass)
+
+        utcnow = dt_util.utcnow()
+        timestamps = [utcnow - timedelta(days=10)] * 6
+        timestamps += [utcnow - timedelta(days=9)] * 3
+        timestamps += [utcnow - timedelta(days=8)] * 3
+        timestamps.append(utcnow)
+
+        with session_scope(hass=hass) as session:
+            states_meta = StatesMeta(entity_id="sensor.test")
+            session.add(states_meta)
+            session.flush()
+            metadata_id = states_meta.metadata_id
+            old_state = None
+            for idx, timestamp in enumerate(timestamps):
+                state = States(
+                    metadata_id=metadata_id,
+                    state=str(idx),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp),
+                    old_state=old_state,
+                    state_attributes=StateAttributes(
+                        hash=idx, shared_attrs=json.dumps({"idx": idx})
+                    ),
+                )
+                session.add(state)
+                old_state = state
+
+        purge_before = utcnow - timedelta(days=4)
+        with session_scope(hass=hass) as session:
+            states = session.query(States).filter(States.metadata_id == metadata_id)
+            state_attributes = session.query(StateAttributes)
+            assert states.count() == 13
+            assert state_attributes.count() == 13
+
+            # The oldest batch all shares one timestamp so it is deleted by id
+            assert not purge_old_data(
+                instance, purge_before, repack=False, states_batch_size=1
+            )
+            assert states.count() == 8
+
+            # The next batch ends at the timestamp of its last state, the
+            # states sharing it are left for the next batch
+            assert not purge_old_data(
+                instance, purge_before, repack=False, states_batch_size=1
+            )
+            assert states.count() == 4
+
+            assert not purge_old_data(
+                instance, purge_before, repack=False, states_batch_size=1
+            )
+            assert states.count() == 1
+            assert purge_old_data(
+                instance, purge_before, repack=False, states_batch_size=1
+            )
+
+            remaining = states.one()
+            assert remaining.state == "12"
+            assert remaining.old_state_id is None
+            assert state_attributes.count() == 1
+
+
+async def test_purge_unused_shared_rows_by_last_used(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test unused attributes and event data are purged by when they were last used."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+
+    utcnow = dt_util.utcnow()
+    eleven_days_ago = utcnow - timedelta(days=11)
+    for timestamp, entity_id, data in (
+        (eleven_days_ago, "sensor.one", {"shared": True}),
+        (eleven_days_ago, "sensor.two", {"old": True}),
+        (utcnow, "sensor.two", {"shared": True}),
+    ):
+        with freeze_time(timestamp):
+            hass.states.async_set(entity_id, "on", data)
+            hass.bus.async_fire("EVENT_TEST", data)
+            await hass.async_block_till_done()
+        await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        attributes_last_used = {
+            attributes.shared_attrs: attributes.last_used_ts
+            for attributes in session.query(StateAttributes)
+        }
+        data_last_used = {
+            data.shared_data: data.last_used_ts for data in session.query(EventData)
+        }
+    assert attributes_last_used['{"shared":true}'] == utcnow.timestamp()
+    assert attributes_last_used['{"old":true}'] == eleven_days_ago.timestamp()
+    assert data_last_used['{"shared":true}'] == utcnow.timestamp()
+    assert data_last_used['{"old":true}'] == eleven_days_ago.timestamp()
+
+    with patch.object(
+        purge,
+        "_select_unused_attributes_ids",
+        wraps=purge._select_unused_attributes_ids,
+    ) as select_unused_attributes_ids, patch.object(
+        purge,
+        "_select_unused_event_data_ids",
+        wraps=purge._select_unused_event_data_ids,
+    ) as select_unused_event_data_ids:
+        assert purge_old_data(instance, utcnow - timedelta(days=4), repack=False)
+
+    # The states and events did not have to be searched
+    assert select_unused_attributes_ids.called
+    assert select_unused_event_data_ids.called
+    assert all(
+        call.args[1] == set() for call in select_unused_attributes_ids.mock_calls
+    )
+    assert all(
+        call.args[1] == set() for call in select_unused_event_data_ids.mock_calls
+    )
+
+    with session_scope(hass=hass) as session:
+        shared_attrs = {
+            attributes.shared_attrs for attributes in session.query(StateAttributes)
+        }
+        shared_data = {data.shared_data for data in session.query(EventData)}
+    assert '{"shared":true}' in shared_attrs
+    assert '{"old":true}' not in shared_attrs
+    assert '{"shared":true}' in shared_data
+    assert '{"old":true}' not in shared_data
+
+
 async def test_purge_old_events_purges_the_event_type_ids(
     async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
 ) -> None:
@@ -1142,6 +1142,116 @@ def test_daily_statistics_sum(
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
 
 
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+def test_daily_statistics_reduced_in_several_queries(
+    hass_recorder: Callable[..., HomeAssistant],
+) -> None:
+    """Test daily statistics of several statistics reduced in several queries."""
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    zero = dt_util.utcnow()
+    day1 = dt_util.as_utc(dt_util.parse_datetime("2022-10-03 00:00:00"))
+    day2 = day1 + timedelta(days=1)
+    day3 = day2 + timedelta(days=1)
+    day4 = day3 + timedelta(days=1)
+
+    energy_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    energy_statistics = [
+        {"start": start, "state": idx, "sum": idx * 2}
+        for idx, start in enumerate(
+            (day1, day1 + timedelta(hours=1), day2, day3 + timedelta(hours=23))
+        )
+    ]
+    power_metadata = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": "Power",
+        "source": "test",
+        "statistic_id": "test:power",
+        "unit_of_measurement": "kW",
+    }
+    power_statistics = [
+        {"start": start, "mean": value, "min": value - 1, "max": value + 1}
+        for start, value in (
+            (day1, 1),
+            (day1 + timedelta(hours=1), 2),
+            (day1 + timedelta(hours=2), 6),
+            (day3, 4),
+        )
+    ]
+    async_add_external_statistics(hass, energy_metadata, energy_statistics)
+    async_add_external_statistics(hass, power_metadata, power_statistics)
+    wait_recording_done(hass)
+
+    with patch.object(statistics, "MAX_PERIODS_PER_REDUCE_QUERY", 2):
+        stats = statistics_during_period(
+            hass,
+            zero,
+            period="day",
+            statistic_ids={"test:total_energy_import", "test:power"},
+            types={"change", "max", "mean", "min", "state"},
+        )
+    assert stats == {
+        "test:power": [
+            {
+                "start": day1.timestamp(),
+                "end": day2.timestamp(),
+                "mean": 3.0,
+                "min": 0.0,
+                "max": 7.0,
+                "state": None,
+                "change": None,
+            },
+            {
+                "start": day3.timestamp(),
+                "end": day4.timestamp(),
+                "mean": 4.0,
+                "min": 3.0,
+                "max": 5.0,
+                "state": None,
+                "change": None,
+            },
+        ],
+        "test:total_energy_import": [
+            {
+                "start": day1.timestamp(),
+                "end": day2.timestamp(),
+                "mean": None,
+                "min": None,
+                "max": None,
+                "state": 1.0,
+                "change": 2.0,
+            },
+            {
+                "start": day2.timestamp(),
+                "end": day3.timestamp(),
+                "mean": None,
+                "min": None,
+                "max": None,
+                "state": 2.0,
+                "change": 2.0,
+            },
+            {
+                "start": day3.timestamp(),
+                "end": day4.timestamp(),
+                "mean": None,
+                "min": None,
+                "max": None,
+                "state": 3.0,
+                "change": 2.0,
+            },
+        ],
+    }
+
+
 @pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
 @pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
 def test_weekly_statistics_mean(
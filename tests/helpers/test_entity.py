@@ -648,6 +648,31 @@ async def test_set_context_expired(hass: HomeAssistant) -> None:
     assert ent._context_set is None
 
 
+async def test_async_write_ha_states(hass: HomeAssistant) -> None:
+    """Test writing the state of multiple entities at once."""
+    context = Context()
+    entities = []
+    for entity_id in ("hello.one", "hello.two", "hello.three"):
+        ent = MockEntity(entity_id=entity_id, state="on")
+        ent.hass = hass
+        entities.append(ent)
+    entities[2].async_set_context(context)
+
+    entity.async_write_ha_states(hass, entities)
+
+    one = hass.states.get("hello.one")
+    two = hass.states.get("hello.two")
+    assert one.state == "on"
+    assert one.context is two.context
+    assert one.last_updated == two.last_updated
+    assert hass.states.get("hello.three").context == context
+
+    ent = entity.Entity()
+    ent.hass = hass
+    with pytest.raises(entity.NoEntitySpecifiedError):
+        entity.async_write_ha_states(hass, [ent])
+
+
 async def test_warn_disabled(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -1390,6 +1415,66 @@ async def test_friendly_name_updated(
     assert state.attributes.get(ATTR_FRIENDLY_NAME) == expected_friendly_name3
 
 
+async def test_friendly_name_cached(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry
+) -> None:
+    """Test the friendly name is only calculated again when it may change."""
+
+    class NamedEntity(entity.Entity):
+        """Entity using the naming of Entity."""
+
+        _attr_has_entity_name = True
+        _attr_unique_id = "qwer"
+        _attr_device_info = {
+            "identifiers": {("hue", "1234")},
+            "name": "Device Bla",
+        }
+
+        def __init__(self) -> None:
+            """Initialize the entity."""
+            self._attr_name = "Power"
+
+    ent = NamedEntity()
+
+    async def async_setup_entry(hass, config_entry, async_add_entities):
+        """Mock setup entry method."""
+        async_add_entities([ent])
+        return True
+
+    platform = MockPlatform(async_setup_entry=async_setup_entry)
+    config_entry = MockConfigEntry(entry_id="super-mock-id")
+    entity_platform = MockEntityPlatform(
+        hass, platform_name=config_entry.domain, platform=platform
+    )
+
+    with patch.object(
+        entity.Entity,
+        "_friendly_name_internal",
+        autospec=True,
+        side_effect=entity.Entity._friendly_name_internal,
+    ) as mock_friendly_name:
+        assert await entity_platform.async_setup_entry(config_entry)
+        await hass.async_block_till_done()
+        ent.async_write_ha_state()
+        ent.async_write_ha_state()
+        assert len(mock_friendly_name.mock_calls) == 1
+        state = hass.states.get(ent.entity_id)
+        assert state.attributes[ATTR_FRIENDLY_NAME] == "Device Bla Power"
+
+        ent._attr_name = "Energy"
+        ent.async_write_ha_state()
+        assert len(mock_friendly_name.mock_calls) == 2
+        state = hass.states.get(ent.entity_id)
+        assert state.attributes[ATTR_FRIENDLY_NAME] == "Device Bla Energy"
+
+        device = device_registry.async_get_device(identifiers={("hue", "1234")})
+        device_registry.async_update_device(device.id, name_by_user="Device Bla2")
+        await hass.async_block_till_done()
+        assert len(mock_friendly_name.mock_calls) == 3
+        state = hass.states.get(ent.entity_id)
+        assert state.attributes[ATTR_FRIENDLY_NAME] == "Device Bla2 Energy"
+
+
 async def test_translation_key(hass: HomeAssistant) -> None:
     """Test translation key property."""
     mock_entity1 = entity.Entity()
@@ -516,6 +516,38 @@ async def test_parallel_updates_sync_platform_updates_in_sequence(
     assert peak_update_count == 1
 
 
+async def test_polling_overruns(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test polling intervals skipped while the entities are updating are counted."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    await component.async_setup({})
+    handle = component._platforms[DOMAIN]
+    release_update = asyncio.Event()
+
+    class SlowEntity(MockEntity):
+        """Mock entity with a slow async_update."""
+
+        async def async_update(self):
+            await release_update.wait()
+
+    await handle.async_add_entities([SlowEntity(should_poll=True)])
+    assert handle.polling_overruns == 0
+    assert handle.last_polling_duration is None
+
+    update_task = hass.async_create_task(handle._update_entity_states(dt_util.utcnow()))
+    await asyncio.sleep(0)
+    await handle._update_entity_states(dt_util.utcnow())
+    await handle._update_entity_states(dt_util.utcnow())
+    assert handle.polling_overruns == 2
+    assert "took longer than the scheduled update interval" in caplog.text
+
+    release_update.set()
+    await update_task
+    assert handle.polling_overruns == 2
+    assert handle.last_polling_duration is not None
+
+
 async def test_raise_error_on_update(hass: HomeAssistant) -> None:
     """Test the add entity if they raise an error on update."""
     updates = []
@@ -51,6 +51,7 @@ from homeassistant.exceptions import (
     MaxLengthExceeded,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import json_dumps
 import homeassistant.util.dt as dt_util
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
@@ -815,6 +816,76 @@ async def test_eventbus_run_immediately(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass: HomeAssistant) -> None:
+    """Test keyed listeners only receive events matching their keys."""
+    calls_a = []
+    calls_b = []
+    old_count = hass.bus.async_listeners().get("test", 0)
+
+    @ha.callback
+    def event_key(event):
+        """Mock key function."""
+        return event.data["key"]
+
+    @ha.callback
+    def listener_a(event):
+        """Mock listener."""
+        calls_a.append(event)
+
+    async def listener_b(event):
+        """Mock listener."""
+        calls_b.append(event)
+
+    unsub_a = hass.bus.async_listen_keyed("test", event_key, "a", listener_a)
+    unsub_b = hass.bus.async_listen_keyed("test", event_key, ["a", "b"], listener_b)
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+    assert hass.bus.async_keyed_listeners("test") == {"a": 2, "b": 1}
+
+    hass.bus.async_fire("test", {"key": "a"})
+    hass.bus.async_fire("test", {"key": "b"})
+    hass.bus.async_fire("test", {"key": "c"})
+    await hass.async_block_till_done()
+
+    assert [event.data["key"] for event in calls_a] == ["a"]
+    assert [event.data["key"] for event in calls_b] == ["a", "b"]
+
+    unsub_a()
+    unsub_b()
+    assert hass.bus.async_keyed_listeners("test") == {}
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+
+    hass.bus.async_fire("test", {"key": "a"})
+    await hass.async_block_till_done()
+    assert len(calls_a) == 1
+    assert len(calls_b) == 2
+
+
+async def test_eventbus_keyed_listener_key_error(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test an exception in the key function is logged."""
+    calls = []
+
+    @ha.callback
+    def event_key(event):
+        """Mock key function."""
+        return event.data["missing"]
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed("test", event_key, "a", listener)
+    hass.bus.async_fire("test", {"key": "a"})
+    await hass.async_block_till_done()
+
+    assert calls == []
+    assert "Error in event key function" in caplog.text
+
+    unsub()
+
+
 async def test_eventbus_unsubscribe_listener(hass: HomeAssistant) -> None:
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -1113,6 +1184,140 @@ async def test_statemachine_force_update(hass: HomeAssistant) -> None:
     assert len(events) == 1
 
 
+async def test_statemachine_shares_unchanged_attributes(hass: HomeAssistant) -> None:
+    """Test a new state shares the unchanged attributes of the previous state."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    old_state = hass.states.get("light.bowl")
+    assert old_state.attributes_json() == '{"brightness":100}'
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    new_state = hass.states.get("light.bowl")
+    assert new_state.attributes is old_state.attributes
+    assert new_state.attributes_json() is old_state.attributes_json()
+    assert new_state.as_dict_json() == json_dumps(new_state.as_dict())
+
+    hass.states.async_set_many([("light.bowl", "on", {"brightness": 100})])
+    newer_state = hass.states.get("light.bowl")
+    assert newer_state.attributes is old_state.attributes
+
+    hass.states.async_set("light.bowl", "on", {"brightness": 50})
+    changed_state = hass.states.get("light.bowl")
+    assert changed_state.attributes == {"brightness": 50}
+    assert changed_state.attributes_json() == '{"brightness":50}'
+
+
+async def test_statemachine_async_set_many(hass: HomeAssistant) -> None:
+    """Test setting multiple states at once."""
+    hass.states.async_set("light.bowl", "on", {})
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", None),
+            ("light.Kitchen", "off", {"brightness": 0}),
+            ("switch.fan", "on", None),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in events] == [
+        "light.kitchen",
+        "switch.fan",
+    ]
+    kitchen = hass.states.get("light.kitchen")
+    fan = hass.states.get("switch.fan")
+    assert kitchen.attributes == {"brightness": 0}
+    assert kitchen.last_updated == fan.last_updated
+    assert kitchen.context is fan.context
+    assert events[0].context is events[1].context
+    assert events[0].data["old_state"] is None
+
+    hass.states.async_set_many([("light.bowl", "on", None)], force_update=True)
+    hass.states.async_set_many([])
+    await hass.async_block_till_done()
+    assert len(events) == 3
+    assert events[2].data["old_state"].state == "on"
+
+
+async def test_statemachine_async_set_many_same_entity(hass: HomeAssistant) -> None:
+    """Test setting the same entity multiple times in one batch."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set_many(
+        [("light.bowl", "on", None), ("light.bowl", "off", None)]
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 2
+    assert events[1].data["old_state"] is events[0].data["new_state"]
+    assert hass.states.get("light.bowl").state == "off"
+
+
+async def test_statemachine_async_set_many_invalid_state(
+    hass: HomeAssistant,
+) -> None:
+    """Test an invalid state does not write any state of the batch."""
+    with pytest.raises(InvalidStateError):
+        hass.states.async_set_many(
+            [("light.bowl", "on", None), ("light.kitchen", "x" * 256, None)]
+        )
+
+    assert hass.states.get("light.bowl") is None
+
+
+async def test_eventbus_async_fire_many(hass: HomeAssistant) -> None:
+    """Test firing multiple events of the same type."""
+    calls = []
+    coro_calls = []
+    keyed_calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    async def coro_listener(event):
+        """Mock coroutine listener."""
+        coro_calls.append(event)
+
+    @ha.callback
+    def keyed_listener(event):
+        """Mock keyed listener."""
+        keyed_calls.append(event)
+
+    @ha.callback
+    def event_filter(event):
+        """Mock filter."""
+        return event.data["key"] != "b"
+
+    unsubs = [
+        hass.bus.async_listen("test", listener, event_filter=event_filter),
+        hass.bus.async_listen_keyed(
+            "test", lambda event: event.data["key"], "b", keyed_listener
+        ),
+    ]
+
+    with patch.object(hass.loop, "call_soon", wraps=hass.loop.call_soon) as call_soon:
+        hass.bus.async_fire_many("test", [{"key": "a"}, {"key": "b"}, {"key": "c"}])
+    # One call for the callback listener and one for the keyed index
+    assert call_soon.call_count == 2
+    await hass.async_block_till_done()
+
+    assert [event.data["key"] for event in calls] == ["a", "c"]
+    assert [event.data["key"] for event in keyed_calls] == ["b"]
+
+    unsubs.append(hass.bus.async_listen("test", coro_listener))
+    hass.bus.async_fire_many("test", [{"key": "a"}, {"key": "b"}])
+    await hass.async_block_till_done()
+
+    assert [event.data["key"] for event in coro_calls] == ["a", "b"]
+    assert len(calls) == 3
+    assert len(keyed_calls) == 2
+
+    for unsub in unsubs:
+        unsub()
+
+
 def test_service_call_repr() -> None:
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1944,6 +2149,28 @@ async def test_async_entity_ids_count(hass: HomeAssistant) -> None:
     assert hass.states.async_entity_ids_count("light") == 3
 
 
+async def test_statemachine_domain_index(hass: HomeAssistant) -> None:
+    """Test domain filtered queries follow sets and removals."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set_many(
+        [("light.frog", "on", None), ("switch.link", "on", None)]
+    )
+    hass.states.async_set("light.bowl", "off")
+
+    assert [state.state for state in hass.states.async_all("light")] == ["off", "on"]
+    assert hass.states.async_entity_ids("LIGHT") == ["light.bowl", "light.frog"]
+    assert hass.states.async_entity_ids_count(["light", "switch"]) == 3
+    assert hass.states.async_all("sensor") == []
+    assert hass.states.async_entity_ids_count("sensor") == 0
+
+    hass.states.async_remove("switch.link")
+    hass.states.async_remove("light.bowl")
+
+    assert hass.states.async_entity_ids(["light", "switch"]) == ["light.frog"]
+    assert hass.states.async_all("switch") == []
+    assert hass.states.async_entity_ids_count("light") == 1
+
+
 async def test_hassjob_forbid_coroutine() -> None:
     """Test hassjob forbids coroutines."""
 